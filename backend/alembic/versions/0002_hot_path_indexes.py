@@ -0,0 +1,38 @@
+"""Indexes for the hot note and plan query paths
+
+- ix_notes_owner_updated_id: list_notes/get_note filter on owner_id and
+  list_notes pages by (updated_at DESC, id DESC).
+- ix_plans_note_id_created_at: list_plans and the selectinload(Note.plans)
+  IN-queries filter on note_id and order by created_at.
+
+See benchmarks/index_plans.py for the query plans before and after.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_notes_owner_updated_id",
+        "notes",
+        ["owner_id", sa.text("updated_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_plans_note_id_created_at", "plans", ["note_id", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_plans_note_id_created_at", table_name="plans")
+    op.drop_index("ix_notes_owner_updated_id", table_name="notes")
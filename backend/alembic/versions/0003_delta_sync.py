@@ -0,0 +1,54 @@
+"""Delta sync: plans.updated_at and delete tombstones
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite cannot ADD COLUMN with a non-constant default, so rebuild the table
+    with op.batch_alter_table("plans", recreate="always") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            )
+        )
+    op.execute("UPDATE plans SET updated_at = created_at")
+
+    op.create_table(
+        "tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("note_id", sa.Integer()),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_tombstones_owner_deleted_at", "tombstones", ["owner_id", "deleted_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tombstones_owner_deleted_at", table_name="tombstones")
+    op.drop_table("tombstones")
+    with op.batch_alter_table("plans", recreate="always") as batch_op:
+        batch_op.drop_column("updated_at")
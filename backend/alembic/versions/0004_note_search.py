@@ -0,0 +1,142 @@
+"""Full-text search over note titles, content and plan titles
+
+PostgreSQL: notes.search_vector (tsvector, weighted title > content > plan
+titles) kept current by triggers on notes and plans, with a GIN index.
+
+SQLite: an FTS5 table notes_fts (rowid = notes.id) kept current by triggers.
+
+Neither object is mapped in app.db.models; see app.db.search.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_SQLITE_PLANS_TEXT = (
+    "(SELECT coalesce(group_concat(title, ' '), '') FROM plans WHERE note_id = {note})"
+)
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE notes_fts USING fts5("
+    "title, content, plans, tokenize = 'unicode61 remove_diacritics 2')",
+    "INSERT INTO notes_fts (rowid, title, content, plans) "
+    "SELECT n.id, n.title, coalesce(n.content, ''), "
+    + _SQLITE_PLANS_TEXT.format(note="n.id")
+    + " FROM notes n",
+    "CREATE TRIGGER notes_fts_insert AFTER INSERT ON notes BEGIN "
+    "INSERT INTO notes_fts (rowid, title, content, plans) "
+    "VALUES (new.id, new.title, coalesce(new.content, ''), ''); END",
+    "CREATE TRIGGER notes_fts_update AFTER UPDATE OF title, content ON notes BEGIN "
+    "UPDATE notes_fts SET title = new.title, content = coalesce(new.content, '') "
+    "WHERE rowid = new.id; END",
+    "CREATE TRIGGER notes_fts_delete AFTER DELETE ON notes BEGIN "
+    "DELETE FROM notes_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER plans_fts_insert AFTER INSERT ON plans BEGIN "
+    "UPDATE notes_fts SET plans = " + _SQLITE_PLANS_TEXT.format(note="new.note_id")
+    + " WHERE rowid = new.note_id; END",
+    "CREATE TRIGGER plans_fts_update AFTER UPDATE OF title, note_id ON plans BEGIN "
+    "UPDATE notes_fts SET plans = " + _SQLITE_PLANS_TEXT.format(note="old.note_id")
+    + " WHERE rowid = old.note_id; "
+    "UPDATE notes_fts SET plans = " + _SQLITE_PLANS_TEXT.format(note="new.note_id")
+    + " WHERE rowid = new.note_id; END",
+    "CREATE TRIGGER plans_fts_delete AFTER DELETE ON plans BEGIN "
+    "UPDATE notes_fts SET plans = " + _SQLITE_PLANS_TEXT.format(note="old.note_id")
+    + " WHERE rowid = old.note_id; END",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS plans_fts_delete",
+    "DROP TRIGGER IF EXISTS plans_fts_update",
+    "DROP TRIGGER IF EXISTS plans_fts_insert",
+    "DROP TRIGGER IF EXISTS notes_fts_delete",
+    "DROP TRIGGER IF EXISTS notes_fts_update",
+    "DROP TRIGGER IF EXISTS notes_fts_insert",
+    "DROP TABLE IF EXISTS notes_fts",
+]
+
+POSTGRES_UPGRADE = [
+    "ALTER TABLE notes ADD COLUMN search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION notes_search_vector(nid integer, ntitle text, ncontent text)
+    RETURNS tsvector AS $$
+        SELECT setweight(to_tsvector('simple', coalesce(ntitle, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(ncontent, '')), 'B')
+            || setweight(to_tsvector('simple', coalesce(
+                (SELECT string_agg(title, ' ') FROM plans WHERE note_id = nid), '')), 'C')
+    $$ LANGUAGE sql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION notes_search_trigger() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := notes_search_vector(NEW.id, NEW.title, NEW.content);
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER notes_search_update
+    BEFORE INSERT OR UPDATE OF title, content ON notes
+    FOR EACH ROW EXECUTE FUNCTION notes_search_trigger()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION plans_search_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE notes SET search_vector = notes_search_vector(id, title, content)
+            WHERE id = OLD.note_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE notes SET search_vector = notes_search_vector(id, title, content)
+            WHERE id = NEW.note_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER plans_search_update
+    AFTER INSERT OR UPDATE OF title, note_id OR DELETE ON plans
+    FOR EACH ROW EXECUTE FUNCTION plans_search_trigger()
+    """,
+    "UPDATE notes SET search_vector = notes_search_vector(id, title, content)",
+    "CREATE INDEX ix_notes_search_vector ON notes USING GIN (search_vector)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS plans_search_update ON plans",
+    "DROP FUNCTION IF EXISTS plans_search_trigger()",
+    "DROP TRIGGER IF EXISTS notes_search_update ON notes",
+    "DROP FUNCTION IF EXISTS notes_search_trigger()",
+    "DROP FUNCTION IF EXISTS notes_search_vector(integer, text, text)",
+    "DROP INDEX IF EXISTS ix_notes_search_vector",
+    "ALTER TABLE notes DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements: Sequence[str]) -> None:
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        _run(POSTGRES_UPGRADE)
+    elif dialect == "sqlite":
+        _run(SQLITE_UPGRADE)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        _run(POSTGRES_DOWNGRADE)
+    elif dialect == "sqlite":
+        _run(SQLITE_DOWNGRADE)
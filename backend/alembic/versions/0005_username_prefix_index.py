@@ -0,0 +1,31 @@
+"""Index for admin username prefix search
+
+ix_users_username_prefix backs ``username LIKE 'prefix%'``. PostgreSQL needs
+text_pattern_ops for LIKE to use a b-tree index under non-C collations; on
+other databases it is a plain index on username.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_users_username_prefix",
+        "users",
+        ["username"],
+        postgresql_ops={"username": "text_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_username_prefix", table_name="users")
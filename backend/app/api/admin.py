@@ -1,33 +1,101 @@
-from typing import List
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Literal, Optional, Sequence, Type, cast
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import selectinload
 
-from app.api.deps import get_admin_user, get_db
-from app.db import models, schemas
+from app.api.deps import (
+    Principal,
+    get_admin_user,
+    get_read_db,
+    get_read_session_maker,
+)
+from app.api.pagination import (
+    MAX_PAGE_LIMIT,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    decode_id_cursor,
+    encode_cursor,
+    encode_id_cursor,
+)
+from app.db import crud, models, schemas
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500
 
-@router.get("/users", response_model=List[schemas.UserOut])
+
+async def _stream_notes_ndjson(
+    session_maker: async_sessionmaker[AsyncSession], view: schemas.NoteView
+) -> AsyncIterator[bytes]:
+    # The session lives inside the generator so it stays open while the
+    # response body is sent, after the request's dependencies have closed
+    async with session_maker() as db:
+        schema: Type[BaseModel]
+        batches: AsyncIterator[Sequence[Any]]
+        if view == "summary":
+            schema = schemas.NoteSummary
+            batches = crud.stream_note_summaries(db, batch_size=STREAM_BATCH_SIZE)
+        else:
+            schema = schemas.NoteOut
+            batches = crud.stream_notes(db, batch_size=STREAM_BATCH_SIZE)
+        async for batch in batches:
+            yield b"".join(
+                schema.model_validate(item).model_dump_json().encode() + b"\n"
+                for item in batch
+            )
+
+
+@router.get("/users", response_model=List[schemas.AdminUserOut])
 async def get_all_users(
-    db: AsyncSession = Depends(get_db),
-    _: str = Depends(get_admin_user)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=50),
+    db: AsyncSession = Depends(get_read_db),
+    _: Principal = Depends(get_admin_user)
 ):
-    """Get all users (admin only)."""
-    result = await db.execute(select(models.User))
-    users = result.scalars().all()
+    """Get users by id with note and plan counts (admin only).
+
+    ``q`` filters by username prefix. With ``limit`` the listing is paginated;
+    the cursor for the next page is returned in the ``X-Next-Cursor`` header.
+    """
+    users = await crud.list_users_with_counts(
+        db,
+        limit=limit + 1 if limit else None,
+        after_id=decode_id_cursor(cursor) if cursor else None,
+        username_prefix=q,
+    )
+    if limit and len(users) > limit:
+        users = users[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_id_cursor(int(users[-1].id))
     return users
 
 
-@router.get("/notes", response_model=List[schemas.NoteOut])
+@router.get("/notes", response_model=schemas.NoteListOut)
 async def get_all_notes(
-    db: AsyncSession = Depends(get_db),
-    _: str = Depends(get_admin_user)
+    view: schemas.NoteView = "full",
+    format: Literal["json", "ndjson"] = "json",
+    db: AsyncSession = Depends(get_read_db),
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_read_session_maker),
+    _: Principal = Depends(get_admin_user)
 ):
-    """Get all notes from all users (admin only)."""
+    """Get all notes from all users (admin only).
+
+    ``format=ndjson`` streams one note per line from a server-side cursor, so
+    memory use does not grow with the number of notes.
+    """
+    if format == "ndjson":
+        return StreamingResponse(
+            _stream_notes_ndjson(session_maker, view), media_type=NDJSON_MEDIA_TYPE
+        )
+    if view == "summary":
+        return await crud.list_note_summaries(db, owner_id=None)
     result = await db.execute(
         select(models.Note)
         .options(selectinload(models.Note.plans))
@@ -40,14 +108,26 @@ async def get_all_notes(
 @router.get("/users/{user_id}/notes", response_model=List[schemas.NoteOut])
 async def get_user_notes(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
-    _: str = Depends(get_admin_user)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    _: Principal = Depends(get_admin_user)
 ):
-    """Get all notes for a specific user (admin only)."""
-    result = await db.execute(
-        select(models.Note)
-        .where(models.Note.owner_id == user_id)
-        .options(selectinload(models.Note.plans))
+    """Get a user's notes, most recently updated first (admin only).
+
+    Paginated like ``GET /notes`` when ``limit`` is given.
+    """
+    notes = await crud.list_notes(
+        db,
+        owner_id=user_id,
+        limit=limit + 1 if limit else None,
+        after=decode_cursor(cursor) if cursor else None,
     )
-    notes = result.scalars().all()
+    if limit and len(notes) > limit:
+        notes = notes[:limit]
+        last = notes[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            cast(datetime, last.updated_at), int(last.id)
+        )
     return notes
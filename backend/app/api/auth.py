@@ -3,17 +3,22 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db  # type: ignore[import]
-from app.core.security import (  # type: ignore[import]
-    create_access_token,
-    get_password_hash,
-    verify_password,
-)
+from app.core.hashing import HashingUnavailable, password_hasher  # type: ignore[import]
+from app.core.security import create_access_token  # type: ignore[import]
 from app.db import crud  # type: ignore[import]
 from app.db.schemas import Token, UserCreate, UserOut  # type: ignore[import]
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=UserOut)
 async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)) -> UserOut:
     existing = await crud.get_user_by_username(db, user_in.username)
@@ -21,9 +26,11 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)) -> U
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Username taken"
         )
-    user = await crud.create_user(
-        db, user_in.username, get_password_hash(user_in.password)
-    )
+    try:
+        password_hash = await password_hasher.hash(user_in.password)
+    except HashingUnavailable:
+        raise _hashing_busy() from None
+    user = await crud.create_user(db, user_in.username, password_hash)
     return UserOut.model_validate(user)
 
 
@@ -32,12 +39,22 @@ async def login(
     form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
 ) -> Token:
     user = await crud.get_user_by_username(db, form_data.username)
-    if not user or not verify_password(form_data.password, str(user.password_hash)):
+    try:
+        valid = user is not None and await password_hasher.verify(
+            form_data.password, str(user.password_hash)
+        )
+    except HashingUnavailable:
+        raise _hashing_busy() from None
+    if not user or not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect username or password",
         )
     token = create_access_token(
-        subject=str(user.username), secret_key="secret", expires_minutes=60 * 24
+        subject=str(user.username),
+        secret_key="secret",
+        expires_minutes=60 * 24,
+        user_id=int(user.id),
+        is_admin=bool(user.is_admin),
     )
     return Token(access_token=token)
@@ -0,0 +1,138 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import Principal, get_current_user, get_db
+from app.db import crud, models
+from app.db.schemas import (
+    BatchIn,
+    BatchOperation,
+    BatchOut,
+    BatchResult,
+    NoteSyncOut,
+    PlanOut,
+)
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+_NOTE_FIELDS = {"title", "content"}
+_PLAN_FIELDS = {"title", "is_done"}
+
+
+def _not_found(
+    op: BatchOperation, owned_notes: Set[int], plan_notes: Dict[int, int]
+) -> Optional[str]:
+    """Why ``op`` targets a row the caller does not own, if it does."""
+    if op.entity == "plan" and op.op != "create":
+        return None if op.id in plan_notes else "Plan not found"
+    if op.entity == "plan":
+        return None if op.note_id in owned_notes else "Note not found"
+    if op.op != "create":
+        return None if op.id in owned_notes else "Note not found"
+    return None
+
+
+@router.post("", response_model=BatchOut)
+async def apply_batch(
+    batch_in: BatchIn,
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+) -> Any:
+    """Apply create/update/delete operations on notes and plans in one transaction.
+
+    Ownership of every referenced note and plan is checked with one query each;
+    operations on rows the caller does not own get a 404 result and are skipped.
+    The rest are applied as multi-row statements grouped by kind - creates, then
+    updates, then deletes - so a plan cannot be created under a note created in
+    the same batch. Results are returned in request order.
+    """
+    ops = batch_in.operations
+    note_ids = {op.id for op in ops if op.entity == "note" and op.op != "create"}
+    note_ids |= {op.note_id for op in ops if op.entity == "plan" and op.op == "create"}
+    plan_ids = {op.id for op in ops if op.entity == "plan" and op.op != "create"}
+    owned_notes = await crud.owned_note_ids(db, user.id, (i for i in note_ids if i))
+    plan_notes = await crud.owned_plan_note_ids(
+        db, user.id, (i for i in plan_ids if i)
+    )
+
+    results: List[Optional[BatchResult]] = [None] * len(ops)
+    groups: Dict[Tuple[str, str], List[Tuple[int, BatchOperation]]] = defaultdict(list)
+    for index, op in enumerate(ops):
+        detail = _not_found(op, owned_notes, plan_notes)
+        if detail:
+            results[index] = BatchResult(
+                status=status.HTTP_404_NOT_FOUND, entity=op.entity, id=op.id, detail=detail
+            )
+        else:
+            groups[(op.op, op.entity)].append((index, op))
+
+    created_notes = await crud.insert_notes(
+        db,
+        [
+            {"title": op.title, "content": op.content, "owner_id": user.id}
+            for _, op in groups[("create", "note")]
+        ],
+    )
+    for (index, _), note in zip(groups[("create", "note")], created_notes):
+        results[index] = BatchResult(
+            status=status.HTTP_201_CREATED, entity="note", id=note.id,
+            note=NoteSyncOut.model_validate(note),
+        )
+
+    created_plans = await crud.insert_plans(
+        db,
+        [
+            {"title": op.title, "is_done": bool(op.is_done), "note_id": op.note_id}
+            for _, op in groups[("create", "plan")]
+        ],
+    )
+    for (index, _), plan in zip(groups[("create", "plan")], created_plans):
+        results[index] = BatchResult(
+            status=status.HTTP_201_CREATED, entity="plan", id=plan.id,
+            plan=PlanOut.model_validate(plan),
+        )
+
+    updated_notes = await crud.update_rows(
+        db,
+        models.Note,
+        [
+            {"id": op.id, **op.model_dump(include=_NOTE_FIELDS, exclude_none=True)}
+            for _, op in groups[("update", "note")]
+        ],
+    )
+    for index, op in groups[("update", "note")]:
+        results[index] = BatchResult(
+            status=status.HTTP_200_OK, entity="note", id=op.id,
+            note=NoteSyncOut.model_validate(updated_notes[op.id]),
+        )
+
+    updated_plans = await crud.update_rows(
+        db,
+        models.Plan,
+        [
+            {"id": op.id, **op.model_dump(include=_PLAN_FIELDS, exclude_none=True)}
+            for _, op in groups[("update", "plan")]
+        ],
+    )
+    for index, op in groups[("update", "plan")]:
+        results[index] = BatchResult(
+            status=status.HTTP_200_OK, entity="plan", id=op.id,
+            plan=PlanOut.model_validate(updated_plans[op.id]),
+        )
+
+    deleted_plans = {
+        op.id: plan_notes[op.id] for _, op in groups[("delete", "plan")] if op.id
+    }
+    await crud.delete_plans(db, user.id, deleted_plans)
+    await crud.delete_notes(
+        db, user.id, (op.id for _, op in groups[("delete", "note")] if op.id)
+    )
+    for index, op in groups[("delete", "plan")] + groups[("delete", "note")]:
+        results[index] = BatchResult(
+            status=status.HTTP_204_NO_CONTENT, entity=op.entity, id=op.id
+        )
+
+    await db.commit()
+    return BatchOut(results=[result for result in results if result is not None])
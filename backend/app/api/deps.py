@@ -1,41 +1,112 @@
-from typing import AsyncGenerator
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.security import decode_token  # type: ignore[import]
-from app.db.base import get_session_maker  # type: ignore[import]
+from app.core.token_cache import token_cache  # type: ignore[import]
+from app.db.base import engines  # type: ignore[import]
+from app.db.routing import (  # type: ignore[import]
+    REPLICA,
+    current_principal_id,
+    read_sessions,
+    read_target,
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller, resolved from token claims."""
+
+    id: int
+    username: str
+    is_admin: bool = False
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    session_maker = get_session_maker()
-    async with session_maker() as session:
+    async with engines.session_maker()() as session:
         yield session
 
 
-async def get_current_username(token: str = Depends(oauth2_scheme)) -> str:
-    payload = decode_token(token, secret_key="secret")
+def _get_token_payload(token: str) -> Dict[str, Any]:
+    payload = token_cache.get(token, secret_key="secret")
     if not payload or "sub" not in payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
-    return str(payload["sub"])
+    return payload
 
 
-async def get_admin_user(
-    username: str = Depends(get_current_username),
-    db: AsyncSession = Depends(get_db)
-) -> str:
-    """Verify that the current user is an admin."""
+async def get_current_username(token: str = Depends(oauth2_scheme)) -> str:
+    return str(_get_token_payload(token)["sub"])
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """Resolve the caller from token claims without touching the database."""
+    payload = _get_token_payload(token)
+    username = str(payload["sub"])
+    if "uid" in payload:
+        current_principal_id.set(int(payload["uid"]))
+        return Principal(
+            id=int(payload["uid"]),
+            username=username,
+            is_admin=bool(payload.get("adm", False)),
+        )
+
+    # Tokens issued before identity claims existed still carry only the username
     from app.db import crud
-    
+
     user = await crud.get_user_by_username(db, username)
-    if not user or not user.is_admin:
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+        )
+    current_principal_id.set(int(user.id))
+    return Principal(id=int(user.id), username=username, is_admin=bool(user.is_admin))
+
+
+async def get_read_session_maker(
+    user: Principal = Depends(get_current_user),
+) -> async_sessionmaker[AsyncSession]:
+    """Session factory for reads, bound to the replica when one is configured.
+
+    Callers who committed a write within READ_AFTER_WRITE_SECONDS read from the
+    primary so they see their own changes.
+    """
+    target = read_target(user.id, engines.is_configured(REPLICA))
+    read_sessions.inc(target=target)
+    return engines.session_maker(target)
+
+
+async def get_read_db(
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_read_session_maker),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only handlers; see get_read_session_maker."""
+    async with session_maker() as session:
+        yield session
+
+
+async def get_admin_user(
+    user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    """Verify that the current user is an admin.
+
+    The ``adm`` claim lives as long as the token (24 hours), so admin routes
+    re-read ``users.is_admin`` to make revocation take effect immediately.
+    Regular routes trust the claims and skip the lookup.
+    """
+    from app.db import crud
+
+    db_user = await crud.get_user(db, user.id)
+    if not db_user or not db_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
-    return username
+    return user
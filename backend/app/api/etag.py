@@ -0,0 +1,41 @@
+"""
+Weak ETags for conditional GETs.
+
+Validators are computed from cheap aggregates (row counts and the latest
+``updated_at``/``deleted_at``) instead of hashing the response body, so a
+matching ``If-None-Match`` is answered with 304 before the listing is queried
+or serialized.
+
+SQLite stores server timestamps with one-second resolution, so two edits of
+the same row within a second share a validator there; PostgreSQL keeps
+microseconds.
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the validator parts (aggregates and request parameters)."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of ``etag`` against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={ETAG_HEADER: etag})
@@ -0,0 +1,113 @@
+"""
+Opt-in fast JSON path for hot read endpoints (``FAST_JSON=true``).
+
+By default FastAPI validates the returned ORM objects against the
+``response_model`` and then encodes the validated model. With the fast path
+the endpoint builds plain dicts straight from the mapped attributes and hands
+them to ``ORJSONResponse``, skipping validation. The dicts mirror ``NoteOut``,
+``PlanOut`` and ``UserOut`` field for field; ``tests/test_fast_json.py`` keeps
+the two paths byte-compatible.
+
+orjson is optional. Without it the response falls back to the standard
+library encoder, which still skips validation.
+"""
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, TypeVar
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.db import models
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+# Headers set on the injected Response that must survive returning our own
+_FORWARDED_HEADERS = ("etag", "x-next-cursor")
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _isoformat(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _isoformat(value: datetime) -> str:
+    # Matches pydantic: UTC is written as "Z"
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson, or the stdlib encoder without it."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(
+                content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+            )
+        return json.dumps(
+            content, default=_default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def plan_out(plan: models.Plan) -> Dict[str, Any]:
+    """``PlanOut`` as a dict, read straight from the mapped attributes."""
+    return {
+        "title": plan.title,
+        "is_done": plan.is_done,
+        "id": plan.id,
+        "note_id": plan.note_id,
+        "created_at": plan.created_at,
+        "updated_at": plan.updated_at,
+    }
+
+
+def note_out(note: models.Note) -> Dict[str, Any]:
+    """``NoteOut`` as a dict; plans must already be loaded."""
+    return {
+        "title": note.title,
+        "content": note.content,
+        "id": note.id,
+        "owner_id": note.owner_id,
+        "created_at": note.created_at,
+        "updated_at": note.updated_at,
+        "plans": [plan_out(plan) for plan in note.plans],
+    }
+
+
+def user_out(user: models.User) -> Dict[str, Any]:
+    """``UserOut`` as a dict."""
+    return {"username": user.username, "id": user.id, "is_admin": user.is_admin}
+
+
+def fast_response(
+    response: Response,
+    content: Any,
+    serializer: Callable[[T], Dict[str, Any]],
+    status_code: Optional[int] = None,
+) -> Any:
+    """Return ``content`` for the endpoint, serialized directly if FAST_JSON is on.
+
+    ``content`` is one ORM object or an iterable of them. With the fast path
+    off it is returned unchanged for ``response_model`` validation; headers
+    already set on ``response`` are carried over either way.
+    """
+    if not settings.FAST_JSON:
+        return content
+    if isinstance(content, Iterable):
+        body: Any = [serializer(item) for item in content]
+    else:
+        body = serializer(content)
+    fast = ORJSONResponse(body, status_code=status_code or response.status_code or 200)
+    for name in _FORWARDED_HEADERS:
+        if name in response.headers:
+            fast.headers[name] = response.headers[name]
+    return fast
+
@@ -1,69 +1,132 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, Optional, cast
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_username, get_db  # type: ignore[import]
+from app.api.deps import (  # type: ignore[import]
+    Principal,
+    get_current_user,
+    get_db,
+    get_read_db,
+)
+from app.api.etag import (  # type: ignore[import]
+    ETAG_HEADER,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
+from app.api.fast_json import fast_response, note_out  # type: ignore[import]
+from app.api.pagination import (  # type: ignore[import]
+    MAX_PAGE_LIMIT,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+)
 from app.db import crud  # type: ignore[import]
-from app.db.schemas import NoteCreate, NoteOut, NoteUpdate  # type: ignore[import]
+from app.db.schemas import (  # type: ignore[import]
+    NoteCreate,
+    NoteListOut,
+    NoteOut,
+    NoteSearchHit,
+    NoteUpdate,
+    NoteView,
+)
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
+MAX_SEARCH_LIMIT = 100
 
-@router.get("", response_model=list[NoteOut])
+
+@router.get("", response_model=NoteListOut)
 async def get_notes(
-    db: AsyncSession = Depends(get_db), username: str = Depends(get_current_username)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    view: NoteView = "full",
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
 ) -> Any:
-    # In MVP we use username as identifier to fetch user and their notes
-    from app.db.crud import (
-        get_user_by_username,  # local import to avoid circulars in small files
+    """List notes, most recently updated first.
+
+    With ``limit`` the listing is paginated; the cursor for the next page is
+    returned in the ``X-Next-Cursor`` header. ``view=summary`` returns a content
+    preview and plan counts instead of full content and plans.
+    Responses carry a weak ETag; a matching ``If-None-Match`` gets a 304.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    version = await crud.notes_version(db, owner_id=user.id)
+    etag = make_etag(user.id, version, view, limit, cursor)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+    list_fn = crud.list_note_summaries if view == "summary" else crud.list_notes
+    notes = await list_fn(
+        db, owner_id=user.id, limit=limit + 1 if limit else None, after=after
     )
+    if limit and len(notes) > limit:
+        notes = notes[:limit]
+        last = notes[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            cast(datetime, last.updated_at), int(last.id)
+        )
+    if view == "summary":
+        return notes
+    return fast_response(response, notes, note_out)
+
+
+@router.get("/search", response_model=list[NoteSearchHit])
+async def search_notes(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+) -> Any:
+    """Full-text search over note titles, content and plan titles.
 
-    user = await get_user_by_username(db, username)
-    if not user:
-        return []
-    return await crud.list_notes(db, owner_id=int(user.id))
+    Results are ranked best first; matched terms in ``snippet`` are wrapped in
+    ``<mark>`` tags. Page with ``limit`` and ``offset``.
+    """
+    return await crud.search_notes(
+        db, owner_id=user.id, query=q, limit=limit, offset=offset
+    )
 
 
 @router.get("/{note_id}", response_model=NoteOut)
 async def get_note(
     note_id: int,
-    db: AsyncSession = Depends(get_db),
-    username: str = Depends(get_current_username)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user)
 ) -> Any:
-    # In MVP we use username as identifier to fetch user and their notes
-    from app.db.crud import (
-        get_user_by_username,  # local import to avoid circulars in small files
-    )
-
-    user = await get_user_by_username(db, username)
-    if not user:
+    version = await crud.note_version(db, note_id=note_id, owner_id=user.id)
+    if version is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
         )
-    note = await crud.get_note(db, note_id=note_id, owner_id=int(user.id))
+    etag = make_etag(note_id, version, "note")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    note = await crud.get_note(db, note_id=note_id, owner_id=user.id)
     if not note:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
         )
-    return note
+    response.headers[ETAG_HEADER] = etag
+    return fast_response(response, note, note_out)
 
 
 @router.post("", response_model=NoteOut, status_code=status.HTTP_201_CREATED)
 async def create_note(
     note_in: NoteCreate,
     db: AsyncSession = Depends(get_db),
-    username: str = Depends(get_current_username),
+    user: Principal = Depends(get_current_user),
 ) -> Any:
-    from app.db.crud import get_user_by_username
-
-    user = await get_user_by_username(db, username)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
     return await crud.create_note(
-        db, owner_id=int(user.id), title=note_in.title, content=note_in.content
+        db, owner_id=user.id, title=note_in.title, content=note_in.content
     )
 
 
@@ -72,16 +135,9 @@ async def update_note(
     note_id: int,
     note_in: NoteUpdate,
     db: AsyncSession = Depends(get_db),
-    username: str = Depends(get_current_username),
+    user: Principal = Depends(get_current_user),
 ) -> Any:
-    from app.db.crud import get_user_by_username
-
-    user = await get_user_by_username(db, username)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
-    note = await crud.get_note(db, note_id=note_id, owner_id=int(user.id))
+    note = await crud.get_note(db, note_id=note_id, owner_id=user.id)
     if not note:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
@@ -95,16 +151,9 @@ async def update_note(
 async def delete_note(
     note_id: int,
     db: AsyncSession = Depends(get_db),
-    username: str = Depends(get_current_username),
+    user: Principal = Depends(get_current_user),
 ) -> None:
-    from app.db.crud import get_user_by_username
-
-    user = await get_user_by_username(db, username)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
-    note = await crud.get_note(db, note_id=note_id, owner_id=int(user.id))
+    note = await crud.get_note(db, note_id=note_id, owner_id=user.id)
     if not note:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
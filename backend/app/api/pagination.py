@@ -0,0 +1,60 @@
+"""
+Opaque keyset cursors for paginated listings.
+
+A cursor encodes the sort key of the last item on a page, so the next page can
+be fetched with an indexed range condition instead of OFFSET.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_LIMIT = 500
+
+
+def encode_cursor(updated_at: datetime, item_id: int) -> str:
+    raw = json.dumps([updated_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def encode_timestamp_cursor(timestamp: datetime) -> str:
+    return base64.urlsafe_b64encode(timestamp.isoformat().encode()).decode().rstrip("=")
+
+
+def decode_timestamp_cursor(cursor: str) -> datetime:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return datetime.fromisoformat(base64.urlsafe_b64decode(padded).decode())
+    except (binascii.Error, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def encode_id_cursor(item_id: int) -> str:
+    return base64.urlsafe_b64encode(str(item_id).encode()).decode().rstrip("=")
+
+
+def decode_id_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded).decode())
+    except (binascii.Error, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(timestamp), int(item_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
@@ -1,11 +1,13 @@
-from typing import Any
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_username, get_db
+from app.api.deps import Principal, get_current_user, get_db, get_read_db
+from app.api.etag import ETAG_HEADER, etag_matches, make_etag, not_modified
+from app.api.fast_json import fast_response, plan_out
 from app.db import crud
-from app.db.schemas import PlanCreate, PlanOut, PlanUpdate
+from app.db.schemas import PlanBatchIn, PlanCreate, PlanOut, PlanUpdate
 
 router = APIRouter(prefix="/notes/{note_id}/plans", tags=["plans"])
 
@@ -13,21 +15,23 @@ router = APIRouter(prefix="/notes/{note_id}/plans", tags=["plans"])
 @router.get("", response_model=list[PlanOut])
 async def get_plans(
     note_id: int,
-    db: AsyncSession = Depends(get_db),
-    username: str = Depends(get_current_username),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
 ) -> Any:
-    from app.db.crud import get_user_by_username
-
-    user = await get_user_by_username(db, username)
-    if not user:
-        return []
-    # ensure note belongs to user
-    note = await crud.get_note(db, note_id=note_id, owner_id=int(user.id))
-    if not note:
+    # ensures the note belongs to the user, and validates the client's copy
+    version = await crud.note_version(db, note_id=note_id, owner_id=user.id)
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
         )
-    return await crud.list_plans(db, note_id=int(note.id))
+    etag = make_etag(note_id, version, "plans")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+    plans = await crud.list_plans(db, note_id=note_id)
+    return fast_response(response, plans, plan_out)
 
 
 @router.post("", response_model=PlanOut, status_code=status.HTTP_201_CREATED)
@@ -35,23 +39,37 @@ async def create_plan(
     note_id: int,
     plan_in: PlanCreate,
     db: AsyncSession = Depends(get_db),
-    username: str = Depends(get_current_username),
+    user: Principal = Depends(get_current_user),
 ) -> Any:
-    from app.db.crud import get_user_by_username
-
-    user = await get_user_by_username(db, username)
-    if not user:
+    # Ownership check only; loading the note would also load its plans
+    if not await crud.owned_note_ids(db, user.id, [note_id]):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
         )
-    note = await crud.get_note(db, note_id=note_id, owner_id=int(user.id))
-    if not note:
+    return await crud.create_plan(
+        db, note_id=note_id, title=plan_in.title, is_done=plan_in.is_done
+    )
+
+
+@router.post(
+    ":batch", response_model=list[PlanOut], status_code=status.HTTP_201_CREATED
+)
+async def create_plans(
+    note_id: int,
+    batch_in: PlanBatchIn,
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+) -> Any:
+    """Create several plans under a note with one multi-row INSERT."""
+    if not await crud.owned_note_ids(db, user.id, [note_id]):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
         )
-    return await crud.create_plan(
-        db, note_id=int(note.id), title=plan_in.title, is_done=plan_in.is_done
+    plans = await crud.insert_plans(
+        db, [{**plan_in.model_dump(), "note_id": note_id} for plan_in in batch_in.plans]
     )
+    await db.commit()
+    return plans
 
 
 @router.put("/{plan_id}", response_model=PlanOut)
@@ -60,28 +78,17 @@ async def update_plan(
     plan_id: int,
     plan_in: PlanUpdate,
     db: AsyncSession = Depends(get_db),
-    username: str = Depends(get_current_username),
+    user: Principal = Depends(get_current_user),
 ) -> Any:
-    from app.db.crud import get_user_by_username
-
-    user = await get_user_by_username(db, username)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
-    note = await crud.get_note(db, note_id=note_id, owner_id=int(user.id))
-    if not note:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
-        )
-    plan = await crud.get_plan(db, plan_id=plan_id, note_id=int(note.id))
+    plan = await crud.update_plan(
+        db, plan_id=plan_id, note_id=note_id, owner_id=user.id,
+        title=plan_in.title, is_done=plan_in.is_done,
+    )
     if not plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found"
         )
-    return await crud.update_plan(
-        db, plan, title=plan_in.title, is_done=plan_in.is_done
-    )
+    return plan
 
 
 @router.delete("/{plan_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -89,24 +96,13 @@ async def delete_plan(
     note_id: int,
     plan_id: int,
     db: AsyncSession = Depends(get_db),
-    username: str = Depends(get_current_username),
+    user: Principal = Depends(get_current_user),
 ) -> None:
-    from app.db.crud import get_user_by_username
-
-    user = await get_user_by_username(db, username)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
-    note = await crud.get_note(db, note_id=note_id, owner_id=int(user.id))
-    if not note:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
-        )
-    plan = await crud.get_plan(db, plan_id=plan_id, note_id=int(note.id))
-    if not plan:
+    deleted = await crud.delete_plan(
+        db, plan_id=plan_id, note_id=note_id, owner_id=user.id
+    )
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found"
         )
-    await crud.delete_plan(db, plan)
     return None
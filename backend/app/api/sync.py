@@ -0,0 +1,40 @@
+from datetime import timedelta
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import Principal, get_current_user, get_db
+from app.api.pagination import decode_timestamp_cursor, encode_timestamp_cursor
+from app.core.config import settings
+from app.db import crud
+from app.db.schemas import SyncOut
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=SyncOut)
+async def sync(
+    since: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+) -> Any:
+    """Return notes, plans and deletions changed since the given cursor.
+
+    Without ``since`` every note and plan is returned. Pass the returned
+    ``cursor`` as ``since`` on the next call. Changes near the cursor may be
+    sent again, so clients should apply them as idempotent upserts/deletes.
+    Deleting a note also deletes its plans; only the note tombstone is sent.
+    """
+    after = None
+    if since:
+        after = decode_timestamp_cursor(since) - timedelta(
+            seconds=settings.SYNC_OVERLAP_SECONDS
+        )
+    now, notes, plans, deleted = await crud.list_changes(db, user.id, after)
+    return SyncOut(
+        cursor=encode_timestamp_cursor(now),
+        notes=notes,
+        plans=plans,
+        deleted=deleted,
+    )
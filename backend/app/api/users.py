@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_username, get_db
+from app.api import deps
+from app.api.fast_json import fast_response, user_out
 from app.db import crud, schemas
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -9,9 +10,10 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/me", response_model=schemas.UserOut)
 async def get_current_user(
-    username: str = Depends(get_current_username),
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    principal: deps.Principal = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_read_db)
 ):
     """Get current user information."""
-    user = await crud.get_user_by_username(db, username)
-    return user
+    user = await crud.get_user(db, principal.id)
+    return fast_response(response, user, user_out)
@@ -0,0 +1,213 @@
+"""
+Response compression negotiated through Accept-Encoding.
+
+``CompressionMiddleware`` is a pure ASGI middleware that compresses response
+bodies with zstd, brotli or gzip, whichever the client ranks highest (ties go
+to the better codec). zstd and brotli are optional and only offered when the
+``zstandard`` / ``brotli`` packages are installed; gzip is always available.
+
+Single-message bodies smaller than ``minimum_size`` are sent as is. Streaming
+bodies (e.g. the admin NDJSON export) are compressed chunk by chunk and
+flushed after each one, so clients see rows as they are produced.
+"""
+import zlib
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None  # type: ignore[assignment]
+
+# Already compressed or not worth compressing
+_SKIP_CONTENT_TYPES = ("image/", "video/", "audio/", "application/zip",
+                       "application/gzip", "application/octet-stream",
+                       "text/event-stream")
+
+
+class _Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _Gzip:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=min(level, 11))
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encoders() -> Dict[str, Callable[[int], _Encoder]]:
+    """Encoders this process can produce, best first."""
+    encoders: Dict[str, Callable[[int], _Encoder]] = {}
+    if zstandard is not None:
+        encoders["zstd"] = _Zstd
+    if brotli is not None:
+        encoders["br"] = _Brotli
+    encoders["gzip"] = _Gzip
+    return encoders
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    ranked: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ranked[coding] = q
+    return ranked
+
+
+def choose_encoding(header: str, encoders: List[str]) -> Optional[str]:
+    """Pick the client's highest-ranked encoding among ``encoders``.
+
+    ``encoders`` is in server preference order, which breaks ties. ``*``
+    stands for any coding not listed explicitly; q=0 rules a coding out.
+    """
+    ranked = parse_accept_encoding(header)
+    best: Optional[Tuple[float, str]] = None
+    for name in encoders:
+        q = ranked.get(name, ranked.get("*", 0.0))
+        if q > 0 and (best is None or q > best[0]):
+            best = (q, name)
+    return best[1] if best else None
+
+
+class CompressionMiddleware:
+    """Compress HTTP responses for clients that accept it."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, level: int = 6) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.encoders = available_encoders()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        encoding = choose_encoding(accept, list(self.encoders)) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(
+            send, encoding, self.encoders[encoding], self.level, self.minimum_size
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        encoder: Callable[[int], _Encoder],
+        level: int,
+        minimum_size: int,
+    ) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._encoder_factory = encoder
+        self._level = level
+        self._minimum_size = minimum_size
+        self._start: Optional[Message] = None
+        self._encoder: Optional[_Encoder] = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self._passthrough = (
+                message["status"] in (204, 304)
+                or "content-encoding" in headers
+                or content_type.startswith(_SKIP_CONTENT_TYPES)
+            )
+            if self._passthrough:
+                await self._send(message)
+            else:
+                # Held until the first body chunk shows whether to compress
+                self._start = message
+            return
+
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self._minimum_size:
+                self._passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            self._encoder = self._encoder_factory(self._level)
+            headers["Content-Encoding"] = self._encoding
+            if more_body:
+                del headers["Content-Length"]
+                await self._send(start)
+            else:
+                body = self._encoder.compress(body) + self._encoder.finish()
+                headers["Content-Length"] = str(len(body))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+
+        encoder = self._encoder
+        assert encoder is not None
+        chunk = encoder.compress(body) if body else b""
+        if not more_body:
+            chunk += encoder.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -15,6 +15,15 @@ class Settings:
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "secret")  # Change in production!
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
+    # Verified-token cache (0 disables); entries never outlive the token's exp
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+    # Password hashing - bcrypt runs off the event loop in a bounded pool
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # thread | process
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    # Jobs allowed to wait for a free worker before requests get 503
+    PASSWORD_HASH_QUEUE_LIMIT: int = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
 
     # CORS Settings
     CORS_ORIGINS: List[str] = [
@@ -30,6 +39,20 @@ class Settings:
     if origins_env := os.getenv("CORS_ORIGINS"):
         CORS_ORIGINS = origins_env.split(",")
 
+    # Response compression (gzip, plus zstd/br when zstandard/brotli are
+    # installed); bodies below the minimum size are sent uncompressed
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "500"))
+    COMPRESSION_LEVEL: int = int(os.getenv("COMPRESSION_LEVEL", "6"))
+
+    # Serialize hot read endpoints straight from ORM rows with orjson, skipping
+    # response_model validation (see app/api/fast_json.py)
+    FAST_JSON: bool = os.getenv("FAST_JSON", "false").lower() in ("1", "true", "yes")
+
+    # Delta sync - changes this close to the cursor are re-sent, so commits that
+    # land after a sync but carry an earlier timestamp are not missed
+    SYNC_OVERLAP_SECONDS: int = int(os.getenv("SYNC_OVERLAP_SECONDS", "5"))
+
     # Database
     DATABASE_URL: str = os.getenv(
         "DATABASE_URL", 
@@ -41,5 +64,33 @@ class Settings:
     if DATABASE_URL.startswith("postgresql://"):
         DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
+    # Optional read replica for list/get endpoints; callers who just wrote keep
+    # reading from the primary for READ_AFTER_WRITE_SECONDS
+    DATABASE_REPLICA_URL: str = os.getenv("DATABASE_REPLICA_URL", "")
+    if DATABASE_REPLICA_URL.startswith("postgresql://"):
+        DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.replace(
+            "postgresql://", "postgresql+asyncpg://", 1
+        )
+    READ_AFTER_WRITE_SECONDS: float = float(os.getenv("READ_AFTER_WRITE_SECONDS", "5"))
+
+    # Log every SQL statement (slow; for debugging only)
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+
+    # Statements at least this slow are logged as JSON to notehub.slow_query
+    # (0 disables); with DEBUG the log entry includes the EXPLAIN plan
+    SLOW_QUERY_SECONDS: float = float(os.getenv("SLOW_QUERY_SECONDS", "0.5"))
+    DEBUG: bool = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+
+    # Connection pool - ignored for SQLite, which does not use a queue pool
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Reconnect before server/proxy idle timeouts drop the connection
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    # asyncpg prepared statements cached per connection; 0 behind PgBouncer
+    # in transaction pooling mode
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
 
 settings = Settings()
@@ -0,0 +1,102 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is deliberately slow, so calling it inside an async handler blocks every
+other request on the worker. PasswordHasher runs hashes in a bounded thread or
+process pool and rejects new work once too many jobs are waiting.
+"""
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+hash_seconds = metrics.histogram(
+    "notehub_password_hash_seconds",
+    "Time spent hashing or verifying a password, including queue wait.",
+    labelnames=("operation",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0, 10.0),
+)
+hash_queue_depth = metrics.gauge(
+    "notehub_password_hash_queue_depth",
+    "Password hashing jobs waiting for a free worker.",
+)
+hash_rejected = metrics.counter(
+    "notehub_password_hash_rejected_total",
+    "Password hashing jobs rejected because the queue was full.",
+)
+
+
+class HashingUnavailable(Exception):
+    """Raised when the hashing queue is full."""
+
+
+class PasswordHasher:
+    """Bounded pool for bcrypt hashing and verification."""
+
+    def __init__(self, max_workers: int, queue_limit: int, executor: str = "thread"):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor}")
+        self.max_workers = max(1, max_workers)
+        self.queue_limit = max(0, queue_limit)
+        self.executor_kind = executor
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Jobs submitted and not yet finished (running or queued)."""
+        return self._pending
+
+    @property
+    def queued(self) -> int:
+        return max(0, self._pending - self.max_workers)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def _run(self, operation: str, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_workers + self.queue_limit:
+            hash_rejected.inc()
+            raise HashingUnavailable("Password hashing queue is full")
+
+        self._pending += 1
+        hash_queue_depth.set(self.queued)
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._pending -= 1
+            hash_queue_depth.set(self.queued)
+            hash_seconds.observe(time.perf_counter() - start, operation=operation)
+
+    async def hash(self, password: str | bytes) -> str:
+        return str(await self._run("hash", get_password_hash, password))
+
+    async def verify(self, plain_password: str | bytes, password_hash: str) -> bool:
+        return bool(
+            await self._run("verify", verify_password, plain_password, password_hash)
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+)
@@ -31,15 +31,24 @@ def verify_password(plain_password: str | bytes, password_hash: str) -> bool:
 
 
 def create_access_token(
-    *, subject: str, secret_key: str, expires_minutes: int = 60
+    *,
+    subject: str,
+    secret_key: str,
+    expires_minutes: int = 60,
+    user_id: Optional[int] = None,
+    is_admin: bool = False,
 ) -> str:
     now = datetime.now(timezone.utc)
     expire = now + timedelta(minutes=expires_minutes)
-    to_encode = {
+    to_encode: Dict[str, Any] = {
         "sub": subject,
         "iat": int(now.timestamp()),
         "exp": int(expire.timestamp()),
     }
+    # Identity claims let request handlers resolve the caller without a DB lookup
+    if user_id is not None:
+        to_encode["uid"] = user_id
+        to_encode["adm"] = is_admin
     return str(jwt.encode(to_encode, secret_key, algorithm=JWT_ALGORITHM))
 
 
@@ -0,0 +1,127 @@
+"""
+Per-request timing.
+
+``TimingMiddleware`` measures every HTTP request and exports the results at
+/metrics: latency by route, database time and statement counts, and requests
+in flight. The same numbers are summarized for the client in a
+``Server-Timing`` header, e.g. ``db;dur=3.1;desc="4 queries", app;dur=9.8``.
+
+Database time is collected by the cursor listeners in
+``app.db.instrumentation``, which add to the ``RequestStats`` of the request
+being served through ``current_request_stats``. For streamed responses the
+header is sent before the body, so it only covers the work done up to then.
+"""
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+request_seconds = metrics.histogram(
+    "notehub_http_request_duration_seconds",
+    "HTTP request latency, by route template.",
+    labelnames=("method", "route", "status"),
+)
+request_db_seconds = metrics.histogram(
+    "notehub_http_request_db_seconds",
+    "Time spent executing SQL statements per HTTP request.",
+    labelnames=("route",),
+)
+request_queries = metrics.histogram(
+    "notehub_http_request_queries",
+    "SQL statements executed per HTTP request.",
+    labelnames=("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+requests_in_flight = metrics.gauge(
+    "notehub_http_requests_in_flight",
+    "HTTP requests currently being served.",
+)
+
+
+@dataclass
+class RequestStats:
+    """Database work done while serving one request."""
+
+    db_seconds: float = 0.0
+    queries: int = 0
+    scope: Optional[Scope] = field(default=None, repr=False)
+
+    @property
+    def route(self) -> Optional[str]:
+        return route_label(self.scope) if self.scope is not None else None
+
+    @property
+    def method(self) -> Optional[str]:
+        return self.scope.get("method") if self.scope is not None else None
+
+    def record_query(self, seconds: float) -> None:
+        self.db_seconds += seconds
+        self.queries += 1
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", '
+            f"app;dur={total_seconds * 1000:.1f}"
+        )
+
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+def route_label(scope: Scope) -> str:
+    """Route template that served the request, e.g. ``/notes/{note_id}``.
+
+    Unmatched paths share one label so scanners cannot blow up cardinality.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class TimingMiddleware:
+    """Record request metrics and add a Server-Timing header."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope=scope)
+        token = current_request_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    SERVER_TIMING_HEADER, stats.server_timing(time.perf_counter() - start)
+                )
+            await send(message)
+
+        requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            requests_in_flight.dec()
+            current_request_stats.reset(token)
+            route = route_label(scope)
+            request_seconds.observe(
+                time.perf_counter() - start,
+                method=scope["method"], route=route, status=str(status_code),
+            )
+            request_db_seconds.observe(stats.db_seconds, route=route)
+            request_queries.observe(stats.queries, route=route)
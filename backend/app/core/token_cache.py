@@ -0,0 +1,77 @@
+"""
+Cache of verified access tokens.
+
+Clients reuse the same bearer token for every request, so decoding it (HMAC
+check plus JSON parsing) each time is wasted work. Verified payloads are kept
+in a bounded LRU and dropped once the token expires or the cache TTL passes.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.security import decode_token
+
+cache_hits = metrics.counter(
+    "notehub_token_cache_hits_total", "Access tokens served from the verified-token cache."
+)
+cache_misses = metrics.counter(
+    "notehub_token_cache_misses_total", "Access tokens that required full verification."
+)
+
+_Entry = Tuple[float, Dict[str, Any]]
+
+
+class TokenCache:
+    """Bounded, TTL-aware LRU of token -> verified payload."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str, *, secret_key: str) -> Optional[Dict[str, Any]]:
+        """Return the verified payload, decoding the token on a cache miss."""
+        if self.max_size <= 0:
+            return decode_token(token, secret_key=secret_key)
+
+        key = (secret_key, token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    cache_hits.inc()
+                    return dict(entry[1])
+                del self._entries[key]
+
+        cache_misses.inc()
+        payload = decode_token(token, secret_key=secret_key)
+        if not payload:
+            return payload
+
+        expires_at = now + self.ttl_seconds
+        if "exp" in payload:
+            expires_at = min(expires_at, float(payload["exp"]))
+        with self._lock:
+            self._entries[key] = (expires_at, dict(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(
+    max_size=settings.TOKEN_CACHE_SIZE, ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS
+)
@@ -1,9 +1,25 @@
 import os
-from typing import Optional
-
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine, AsyncEngine
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
+from app.core.config import settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import InstrumentedPool
+from app.db.slow_query import SlowQueryLog
+
 
 def get_database_url() -> str:
     """Get database URL and convert to asyncpg if needed."""
@@ -19,60 +35,148 @@ def get_database_url() -> str:
     return url
 
 
-def create_engine() -> AsyncEngine:
-    return create_async_engine(get_database_url(), echo=True)
+def engine_options(url: str, name: str = "primary") -> Dict[str, Any]:
+    """Engine keyword arguments for ``url`` built from the DB_* settings."""
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO}
+    backend = make_url(url)
+    if backend.get_backend_name() == "sqlite":
+        return options
+    options.update(
+        poolclass=InstrumentedPool,
+        pool_logging_name=name,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if backend.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
 
 
-def create_session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+def create_session_maker(
+    bind: Union[AsyncEngine, AsyncConnection], **options: Any
+) -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(
-        bind=engine,
+        bind=bind,
         autocommit=False,
         autoflush=False,
         expire_on_commit=False,
         class_=AsyncSession,
+        **options,
     )
 
 
-# Global engine and session maker - will be recreated if DATABASE_URL changes
-_engine: Optional[AsyncEngine] = None
-_session_maker: Optional[async_sessionmaker[AsyncSession]] = None
-_current_db_url: Optional[str] = None
+class EngineRegistry:
+    """Engines and session factories by name, built once at application startup.
+
+    The FastAPI lifespan configures the registry before serving and disposes it
+    on shutdown. Tests configure it explicitly to point at their own database.
+    """
+
+    def __init__(self) -> None:
+        self._engines: Dict[str, AsyncEngine] = {}
+        self._session_makers: Dict[str, async_sessionmaker[AsyncSession]] = {}
+
+    def configure(self, url: str, name: str = "primary") -> AsyncEngine:
+        """Create the engine ``name`` for ``url``, replacing any existing one.
+
+        A replaced engine is not disposed; call dispose() first if it was used.
+        """
+        engine = create_async_engine(url, **engine_options(url, name))
+        slow_query_log = (
+            SlowQueryLog(settings.SLOW_QUERY_SECONDS, explain=settings.DEBUG)
+            if settings.SLOW_QUERY_SECONDS > 0
+            else None
+        )
+        instrument_engine(engine.sync_engine, slow_query_log)
+        self._engines[name] = engine
+        self._session_makers[name] = create_session_maker(engine)
+        return engine
+
+    def bind(
+        self, engine: AsyncEngine, connection: AsyncConnection, name: str = "primary"
+    ) -> None:
+        """Serve ``name`` from a transaction already open on ``connection``.
+
+        Sessions commit to SAVEPOINTs inside that transaction, so the owner of
+        ``connection`` can roll back everything they wrote. Tests use this to
+        share one schema and undo each test's writes. Call unbind() afterwards;
+        the engine belongs to the caller and is not disposed here.
+        """
+        self._engines[name] = engine
+        self._session_makers[name] = create_session_maker(
+            connection, join_transaction_mode="create_savepoint"
+        )
+
+    def unbind(self, name: str = "primary") -> None:
+        self._engines.pop(name, None)
+        self._session_makers.pop(name, None)
+
+    def is_configured(self, name: str = "primary") -> bool:
+        return name in self._engines
+
+    def engine(self, name: str = "primary") -> AsyncEngine:
+        try:
+            return self._engines[name]
+        except KeyError:
+            raise RuntimeError(f"Database engine {name!r} is not configured") from None
+
+    def session_maker(self, name: str = "primary") -> async_sessionmaker[AsyncSession]:
+        try:
+            return self._session_makers[name]
+        except KeyError:
+            raise RuntimeError(f"Database engine {name!r} is not configured") from None
+
+    async def dispose(self) -> None:
+        """Close every engine's pooled connections and forget the engines."""
+        engines = list(self._engines.values())
+        self._engines.clear()
+        self._session_makers.clear()
+        for engine in engines:
+            await engine.dispose()
+
+
+engines = EngineRegistry()
 
 
 def get_engine() -> AsyncEngine:
-    global _engine, _current_db_url
-    current_url = get_database_url()
-    if _engine is None or _current_db_url != current_url:
-        _engine = create_engine()
-        _current_db_url = current_url
-    return _engine
+    return engines.engine()
 
 
 def get_session_maker() -> async_sessionmaker[AsyncSession]:
-    global _session_maker, _current_db_url
-    current_url = get_database_url()
-    engine = get_engine()
-    if _session_maker is None or _current_db_url != current_url:
-        _session_maker = create_session_maker(engine)
-        _current_db_url = current_url
-    return _session_maker
-
-
-# Initialize engine and session maker
-engine = get_engine()
-SessionLocal = get_session_maker()
+    return engines.session_maker()
 
 
 class Base(DeclarativeBase):
     pass
 
 
-async def init_db() -> None:
-    # Import models so that metadata is populated before create_all
-    from app.db import models as _models  # noqa: F401
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "alembic"
+BASELINE_REVISION = "0001"
 
-    assert _models is not None  # reference to avoid unused-import warnings
 
-    current_engine = get_engine()
-    async with current_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+def get_alembic_config() -> Config:
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    return config
+
+
+def _upgrade_schema(connection: Connection) -> None:
+    config = get_alembic_config()
+    config.attributes["connection"] = connection
+    tables = set(inspect(connection).get_table_names())
+    if "users" in tables and "alembic_version" not in tables:
+        # Database created by create_all before migrations existed
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+
+
+async def init_db() -> None:
+    """Bring the schema up to date by running Alembic migrations."""
+    async with get_engine().begin() as conn:
+        await conn.run_sync(_upgrade_schema)
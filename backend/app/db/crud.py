@@ -1,13 +1,58 @@
-from typing import Optional, Sequence
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
-from sqlalchemy import select
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    Select,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.db import models
+from app.db import models, search
+
+# SQLite stores server-side CURRENT_TIMESTAMP values without fractional seconds,
+# so keyset cursors must be bound in that format to compare equal to stored rows.
+_CursorTimestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d "
+        "%(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
+NOTE_PREVIEW_LENGTH = 160
+
+_Model = TypeVar("_Model", models.Note, models.Plan)
 
 
 # Users
+async def get_user(db: AsyncSession, user_id: int) -> Optional[models.User]:
+    return await db.get(models.User, user_id)
+
+
 async def get_user_by_username(
     db: AsyncSession, username: str
 ) -> Optional[models.User]:
@@ -15,6 +60,46 @@ async def get_user_by_username(
     return res.scalar_one_or_none()
 
 
+async def list_users_with_counts(
+    db: AsyncSession,
+    *,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    username_prefix: Optional[str] = None,
+) -> Sequence[Row]:
+    """Users by id with their note and plan counts, in one query.
+
+    The page of users is selected first (keyset on id, optional username prefix)
+    and only those users' notes and plans are aggregated.
+    """
+    page = select(models.User.id, models.User.username, models.User.is_admin)
+    if username_prefix:
+        page = page.where(models.User.username.startswith(username_prefix, autoescape=True))
+    if after_id is not None:
+        page = page.where(models.User.id > after_id)
+    page = page.order_by(models.User.id)
+    if limit is not None:
+        page = page.limit(limit)
+    users = page.subquery("users_page")
+
+    stmt = (
+        select(
+            users.c.id,
+            users.c.username,
+            users.c.is_admin,
+            func.count(func.distinct(models.Note.id)).label("note_count"),
+            func.count(models.Plan.id).label("plan_count"),
+        )
+        .select_from(users)
+        .outerjoin(models.Note, models.Note.owner_id == users.c.id)
+        .outerjoin(models.Plan, models.Plan.note_id == models.Note.id)
+        .group_by(users.c.id, users.c.username, users.c.is_admin)
+        .order_by(users.c.id)
+    )
+    res = await db.execute(stmt)
+    return res.all()
+
+
 async def create_user(
     db: AsyncSession, username: str, password_hash: str
 ) -> models.User:
@@ -26,15 +111,169 @@ async def create_user(
 
 
 # Notes
-async def list_notes(db: AsyncSession, owner_id: int) -> Sequence[models.Note]:
-    res = await db.execute(
+def _page_notes(
+    stmt: Select, limit: Optional[int], after: Optional[Tuple[datetime, int]]
+) -> Select:
+    """Order newest first and apply a keyset page after (updated_at, id)."""
+    stmt = stmt.order_by(models.Note.updated_at.desc(), models.Note.id.desc())
+    if after is not None:
+        stmt = stmt.where(
+            tuple_(models.Note.updated_at, models.Note.id)
+            < tuple_(
+                literal(after[0], _CursorTimestamp), literal(after[1], Integer)
+            )
+        )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+async def list_notes(
+    db: AsyncSession,
+    owner_id: int,
+    *,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+) -> Sequence[models.Note]:
+    """List notes newest first, optionally one keyset page after (updated_at, id)."""
+    stmt = (
         select(models.Note)
         .where(models.Note.owner_id == owner_id)
         .options(selectinload(models.Note.plans))
     )
+    res = await db.execute(_page_notes(stmt, limit, after))
     return res.scalars().all()
 
 
+def _note_summaries_stmt(owner_id: Optional[int]) -> Select:
+    plans = models.Plan
+    plan_count = (
+        select(func.count(plans.id))
+        .where(plans.note_id == models.Note.id)
+        .scalar_subquery()
+    )
+    done_count = (
+        select(func.count(plans.id))
+        .where(plans.note_id == models.Note.id, plans.is_done.is_(True))
+        .scalar_subquery()
+    )
+    stmt = select(
+        models.Note.id,
+        models.Note.owner_id,
+        models.Note.title,
+        func.substr(models.Note.content, 1, NOTE_PREVIEW_LENGTH).label("preview"),
+        models.Note.created_at,
+        models.Note.updated_at,
+        plan_count.label("plan_count"),
+        done_count.label("done_count"),
+    )
+    if owner_id is not None:
+        stmt = stmt.where(models.Note.owner_id == owner_id)
+    return stmt
+
+
+async def list_note_summaries(
+    db: AsyncSession,
+    owner_id: Optional[int],
+    *,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+) -> Sequence[Row]:
+    """List lightweight note rows: a content preview and plan counts, no plans.
+
+    Only the selected columns are read, so full content and plan rows are never
+    transferred or hydrated into ORM objects. ``owner_id=None`` lists all notes.
+    """
+    res = await db.execute(_page_notes(_note_summaries_stmt(owner_id), limit, after))
+    return res.all()
+
+
+async def stream_notes(
+    db: AsyncSession, *, batch_size: int
+) -> AsyncIterator[Sequence[models.Note]]:
+    """Yield every note with its plans, ``batch_size`` notes at a time, by id.
+
+    Rows come from a server-side cursor and each batch is expunged from the
+    session once the caller is done with it, so memory does not grow with the
+    table.
+    """
+    res = await db.stream_scalars(
+        select(models.Note)
+        .options(selectinload(models.Note.plans))
+        .order_by(models.Note.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async for batch in res.partitions():
+        yield batch
+        for note in batch:
+            db.expunge(note)  # cascades to the note's plans
+
+
+async def stream_note_summaries(
+    db: AsyncSession, *, batch_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield every note summary row, ``batch_size`` rows at a time, by id."""
+    res = await db.stream(
+        _note_summaries_stmt(None)
+        .order_by(models.Note.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async for batch in res.partitions():
+        yield batch
+
+
+async def notes_version(db: AsyncSession, owner_id: int) -> Tuple[Any, ...]:
+    """Aggregates that change whenever any of the owner's notes or plans change.
+
+    Counts catch deletions, the latest updated_at catches edits, and the latest
+    tombstone catches a delete followed by a create.
+    """
+    note = models.Note
+    plan = models.Plan
+    owned_plans = select(plan.id).join(note, plan.note_id == note.id).where(
+        note.owner_id == owner_id
+    )
+    res = await db.execute(
+        select(
+            select(func.count(note.id)).where(note.owner_id == owner_id).scalar_subquery(),
+            select(func.max(note.updated_at)).where(note.owner_id == owner_id).scalar_subquery(),
+            select(func.count(plan.id)).where(plan.id.in_(owned_plans)).scalar_subquery(),
+            select(func.max(plan.updated_at)).where(plan.id.in_(owned_plans)).scalar_subquery(),
+            select(func.max(models.Tombstone.deleted_at))
+            .where(models.Tombstone.owner_id == owner_id)
+            .scalar_subquery(),
+        )
+    )
+    return tuple(res.one())
+
+
+async def note_version(
+    db: AsyncSession, note_id: int, owner_id: int
+) -> Optional[Tuple[Any, ...]]:
+    """Aggregates that change whenever the note or its plans change; None if not found."""
+    res = await db.execute(
+        select(
+            models.Note.updated_at,
+            func.count(models.Plan.id),
+            func.max(models.Plan.updated_at),
+        )
+        .outerjoin(models.Plan, models.Plan.note_id == models.Note.id)
+        .where(models.Note.id == note_id, models.Note.owner_id == owner_id)
+        .group_by(models.Note.id, models.Note.updated_at)
+    )
+    row = res.one_or_none()
+    return tuple(row) if row is not None else None
+
+
+async def search_notes(
+    db: AsyncSession, owner_id: int, query: str, *, limit: int, offset: int = 0
+) -> Sequence[Row]:
+    """Full-text search over the owner's notes, best match first."""
+    return await search.search_notes(
+        db, owner_id=owner_id, query=query, limit=limit, offset=offset
+    )
+
+
 async def get_note(
     db: AsyncSession, note_id: int, owner_id: int
 ) -> Optional[models.Note]:
@@ -49,30 +288,46 @@ async def get_note(
 async def create_note(
     db: AsyncSession, owner_id: int, title: str, content: Optional[str]
 ) -> models.Note:
-    note = models.Note(title=title, content=content, owner_id=owner_id)
-    db.add(note)
+    # RETURNING brings back id and server-side timestamps with the INSERT itself
+    res = await db.scalars(
+        insert(models.Note)
+        .values(title=title, content=content, owner_id=owner_id)
+        .returning(models.Note)
+    )
+    note = res.one()
+    set_committed_value(note, "plans", [])  # a new note has no plans to load
     await db.commit()
-    await db.refresh(note)  # Refresh to get all scalar attributes (id, created_at, updated_at)
-    # Load plans relationship explicitly (empty list for new note)
-    await db.refresh(note, ["plans"])
     return note
 
 
 async def update_note(
     db: AsyncSession, note: models.Note, title: Optional[str], content: Optional[str]
 ) -> models.Note:
-    if title is not None:
-        note.title = title  # type: ignore[assignment]
-    if content is not None:
-        note.content = content  # type: ignore[assignment]
-    await db.commit()
-    await db.refresh(note)  # Refresh to get updated_at
-    # Load plans relationship explicitly
-    await db.refresh(note, ["plans"])
+    changes = {
+        key: value
+        for key, value in (("title", title), ("content", content))
+        if value is not None
+    }
+    if changes:
+        # Refreshes the already loaded note in place, including updated_at;
+        # its plans are left as they are
+        await db.execute(
+            update(models.Note)
+            .where(models.Note.id == note.id)
+            .values(**changes)
+            .returning(models.Note)
+        )
+        await db.commit()
     return note
 
 
 async def delete_note(db: AsyncSession, note: models.Note) -> None:
+    # A note tombstone also covers its plans, which are deleted with it
+    db.add(
+        models.Tombstone(
+            owner_id=note.owner_id, entity="note", entity_id=note.id, note_id=note.id
+        )
+    )
     await db.delete(note)
     await db.commit()
 
@@ -87,33 +342,230 @@ async def list_plans(db: AsyncSession, note_id: int) -> Sequence[models.Plan]:
     return res.scalars().all()
 
 
-async def get_plan(db: AsyncSession, plan_id: int, note_id: int) -> Optional[models.Plan]:
-    res = await db.execute(
-        select(models.Plan).where(
-            models.Plan.id == plan_id, models.Plan.note_id == note_id
-        )
-    )
-    return res.scalar_one_or_none()
-
-
 async def create_plan(db: AsyncSession, note_id: int, title: str, is_done: bool) -> models.Plan:
-    plan = models.Plan(title=title, is_done=is_done, note_id=note_id)
-    db.add(plan)
+    res = await db.scalars(
+        insert(models.Plan)
+        .values(title=title, is_done=is_done, note_id=note_id)
+        .returning(models.Plan)
+    )
+    plan = res.one()
     await db.commit()
-    await db.refresh(plan)
     return plan
 
 
-async def update_plan(db: AsyncSession, plan: models.Plan, *, title: Optional[str] = None, is_done: Optional[bool] = None) -> models.Plan:
+def _owned_plan(plan_id: int, note_id: int, owner_id: int) -> Tuple[Any, ...]:
+    """WHERE clauses matching a plan only if its note belongs to ``owner_id``."""
+    owned_note = select(models.Note.id).where(
+        models.Note.id == note_id, models.Note.owner_id == owner_id
+    )
+    return (models.Plan.id == plan_id, models.Plan.note_id.in_(owned_note))
+
+
+async def update_plan(
+    db: AsyncSession,
+    plan_id: int,
+    note_id: int,
+    owner_id: int,
+    *,
+    title: Optional[str] = None,
+    is_done: Optional[bool] = None,
+) -> Optional[models.Plan]:
+    """Update a plan in one ownership-scoped statement; None if it is not the owner's."""
+    changes: Dict[str, Any] = {}
     if title is not None:
-        plan.title = title  # type: ignore[assignment]
+        changes["title"] = title
     if is_done is not None:
-        plan.is_done = is_done  # type: ignore[assignment]
-    await db.commit()
-    await db.refresh(plan)
+        changes["is_done"] = is_done
+    if not changes:
+        res = await db.scalars(
+            select(models.Plan).where(*_owned_plan(plan_id, note_id, owner_id))
+        )
+        return res.one_or_none()
+    res = await db.scalars(
+        update(models.Plan)
+        .where(*_owned_plan(plan_id, note_id, owner_id))
+        .values(**changes)
+        .returning(models.Plan),
+        execution_options={"synchronize_session": False},
+    )
+    plan = res.one_or_none()
+    if plan is not None:
+        await db.commit()
     return plan
 
 
-async def delete_plan(db: AsyncSession, plan: models.Plan) -> None:
-    await db.delete(plan)
+async def delete_plan(db: AsyncSession, plan_id: int, note_id: int, owner_id: int) -> bool:
+    """Delete a plan in one ownership-scoped statement; False if it is not the owner's."""
+    res = await db.execute(
+        delete(models.Plan)
+        .where(*_owned_plan(plan_id, note_id, owner_id))
+        .returning(models.Plan.id),
+        execution_options={"synchronize_session": False},
+    )
+    if res.scalar_one_or_none() is None:
+        return False
+    db.add(
+        models.Tombstone(
+            owner_id=owner_id, entity="plan", entity_id=plan_id, note_id=note_id
+        )
+    )
     await db.commit()
+    return True
+
+
+# Batches
+# These stage multi-row statements without committing, so a caller can apply a
+# whole batch in one transaction.
+async def owned_note_ids(
+    db: AsyncSession, owner_id: int, note_ids: Iterable[int]
+) -> Set[int]:
+    """The subset of ``note_ids`` owned by ``owner_id``."""
+    ids = set(note_ids)
+    if not ids:
+        return set()
+    res = await db.execute(
+        select(models.Note.id).where(
+            models.Note.id.in_(ids), models.Note.owner_id == owner_id
+        )
+    )
+    return set(res.scalars().all())
+
+
+async def owned_plan_note_ids(
+    db: AsyncSession, owner_id: int, plan_ids: Iterable[int]
+) -> Dict[int, int]:
+    """Map each of ``plan_ids`` owned by ``owner_id`` to its note id."""
+    ids = set(plan_ids)
+    if not ids:
+        return {}
+    res = await db.execute(
+        select(models.Plan.id, models.Plan.note_id)
+        .join(models.Note, models.Plan.note_id == models.Note.id)
+        .where(models.Plan.id.in_(ids), models.Note.owner_id == owner_id)
+    )
+    return {plan_id: note_id for plan_id, note_id in res.all()}
+
+
+async def insert_notes(
+    db: AsyncSession, rows: Sequence[Mapping[str, Any]]
+) -> Sequence[models.Note]:
+    """Insert notes in one multi-row INSERT ... RETURNING, in input order."""
+    if not rows:
+        return []
+    res = await db.scalars(
+        insert(models.Note).returning(models.Note, sort_by_parameter_order=True),
+        list(rows),
+    )
+    notes = res.all()
+    for note in notes:
+        set_committed_value(note, "plans", [])
+    return notes
+
+
+async def insert_plans(
+    db: AsyncSession, rows: Sequence[Mapping[str, Any]]
+) -> Sequence[models.Plan]:
+    """Insert plans in one multi-row INSERT ... RETURNING, in input order."""
+    if not rows:
+        return []
+    res = await db.scalars(
+        insert(models.Plan).returning(models.Plan, sort_by_parameter_order=True),
+        list(rows),
+    )
+    return res.all()
+
+
+async def update_rows(
+    db: AsyncSession, model: Type[_Model], rows: Sequence[Mapping[str, Any]]
+) -> Dict[int, _Model]:
+    """Bulk UPDATE by primary key, then read the updated rows back in one query.
+
+    Each row holds ``id`` plus the columns to change; rows with nothing to change
+    are only read back.
+    """
+    if not rows:
+        return {}
+    changes = [dict(row) for row in rows if len(row) > 1]
+    if changes:
+        await db.execute(update(model), changes)
+    res = await db.scalars(
+        select(model)
+        .where(model.id.in_({row["id"] for row in rows}))
+        .execution_options(populate_existing=True)
+    )
+    return {int(obj.id): obj for obj in res.all()}
+
+
+async def delete_notes(
+    db: AsyncSession, owner_id: int, note_ids: Iterable[int]
+) -> None:
+    """Delete notes with their plans and record a tombstone for each note."""
+    ids = set(note_ids)
+    if not ids:
+        return
+    await db.execute(delete(models.Plan).where(models.Plan.note_id.in_(ids)))
+    await db.execute(delete(models.Note).where(models.Note.id.in_(ids)))
+    await db.execute(
+        insert(models.Tombstone),
+        [
+            {"owner_id": owner_id, "entity": "note", "entity_id": i, "note_id": i}
+            for i in sorted(ids)
+        ],
+    )
+
+
+async def delete_plans(
+    db: AsyncSession, owner_id: int, plan_note_ids: Mapping[int, int]
+) -> None:
+    """Delete plans (id -> note id) and record a tombstone for each."""
+    if not plan_note_ids:
+        return
+    await db.execute(
+        delete(models.Plan).where(models.Plan.id.in_(set(plan_note_ids)))
+    )
+    await db.execute(
+        insert(models.Tombstone),
+        [
+            {"owner_id": owner_id, "entity": "plan", "entity_id": i, "note_id": n}
+            for i, n in sorted(plan_note_ids.items())
+        ],
+    )
+
+
+# Sync
+async def list_changes(
+    db: AsyncSession, owner_id: int, since: Optional[datetime]
+) -> Tuple[
+    datetime, Sequence[models.Note], Sequence[models.Plan], Sequence[models.Tombstone]
+]:
+    """Notes, plans and tombstones changed at or after ``since`` (all if None).
+
+    Returns the database time read before the changes, to be used as the next
+    ``since``. Rows changed in the same instant may be returned twice.
+    """
+    now = (await db.execute(select(func.now()))).scalar_one()
+
+    notes_stmt = select(models.Note).where(models.Note.owner_id == owner_id)
+    plans_stmt = (
+        select(models.Plan)
+        .join(models.Note, models.Plan.note_id == models.Note.id)
+        .where(models.Note.owner_id == owner_id)
+    )
+    tombstones: Sequence[models.Tombstone] = []
+    if since is not None:
+        bound = literal(since, _CursorTimestamp)
+        notes_stmt = notes_stmt.where(models.Note.updated_at >= bound)
+        plans_stmt = plans_stmt.where(models.Plan.updated_at >= bound)
+        res = await db.execute(
+            select(models.Tombstone)
+            .where(
+                models.Tombstone.owner_id == owner_id,
+                models.Tombstone.deleted_at >= bound,
+            )
+            .order_by(models.Tombstone.id)
+        )
+        tombstones = res.scalars().all()
+
+    notes = (await db.execute(notes_stmt.order_by(models.Note.id))).scalars().all()
+    plans = (await db.execute(plans_stmt.order_by(models.Plan.id))).scalars().all()
+    return now, notes, plans, tombstones
@@ -0,0 +1,139 @@
+"""
+Statement timing and recording for every configured engine.
+
+Cursor events time each SQL statement and add it to the current request's
+``RequestStats`` (see ``app.core.timing``). Statements run outside a request,
+e.g. migrations at startup, are not recorded.
+
+``record_queries()`` additionally captures the statements themselves while
+active; the test suite uses it to enforce per-endpoint query budgets and to
+catch N+1 patterns (see the ``query_budget`` fixture in tests/conftest.py).
+"""
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Collection, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, ExceptionContext
+
+from app.core.timing import current_request_stats
+from app.db.slow_query import SlowQueryLog
+
+# Attribute stashed on the ExecutionContext, so a failed statement leaves
+# nothing behind on the connection
+_START_ATTR = "_notehub_query_start"
+
+# Placeholder lists from expanding IN parameters, e.g. "(?, ?, ?)" or "($1, $2)"
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|\$\d+|%\(\w+\)s|:\w+)\s*,?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Statement shape with whitespace and IN-list lengths collapsed."""
+    return _PLACEHOLDER_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryRecorder:
+    """SQL statements executed while the recorder is active.
+
+    Statements whose first keyword is in ``ignore`` (e.g. ``SAVEPOINT``) are
+    not recorded.
+    """
+
+    def __init__(self, ignore: Collection[str] = ()) -> None:
+        self.statements: List[str] = []
+        self.ignore = frozenset(verb.upper() for verb in ignore)
+
+    def add(self, statement: str) -> None:
+        if _verb(statement) not in self.ignore:
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def verbs(self) -> List[str]:
+        """First keyword of each statement, e.g. ``["SELECT", "UPDATE"]``."""
+        return [_verb(statement) for statement in self.statements]
+
+    def repeated(self, threshold: int = 2) -> Dict[str, int]:
+        """Statement shapes executed at least ``threshold`` times.
+
+        The same SELECT issued once per row of an earlier result is the
+        signature of an N+1 query.
+        """
+        counts = Counter(normalize_statement(s) for s in self.statements)
+        return {shape: n for shape, n in counts.items() if n >= threshold}
+
+    def report(self) -> str:
+        return "\n".join(
+            f"{i}. {normalize_statement(s)}" for i, s in enumerate(self.statements, 1)
+        )
+
+
+current_query_recorder: ContextVar[Optional[QueryRecorder]] = ContextVar(
+    "current_query_recorder", default=None
+)
+
+
+def _verb(statement: str) -> str:
+    return statement.split(maxsplit=1)[0].upper() if statement.strip() else ""
+
+
+@contextmanager
+def record_queries(ignore: Collection[str] = ()) -> Iterator[QueryRecorder]:
+    """Record every statement executed in this context until the block exits."""
+    recorder = QueryRecorder(ignore)
+    token = current_query_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        current_query_recorder.reset(token)
+
+
+def instrument_engine(
+    engine: Engine, slow_query_log: Optional[SlowQueryLog] = None
+) -> None:
+    """Time statements run through ``engine`` (the AsyncEngine's ``sync_engine``).
+
+    With ``slow_query_log``, statements over its threshold are also logged.
+    """
+    def after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any,
+                             context: Any, executemany: bool) -> None:
+        duration = _finish(context)
+        if slow_query_log is not None and duration is not None:
+            slow_query_log.observe(conn, statement, parameters, executemany, duration)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any,
+                           context: Any, executemany: bool) -> None:
+    recorder = current_query_recorder.get()
+    if recorder is not None:
+        recorder.add(statement)
+    if context is not None:
+        setattr(context, _START_ATTR, time.perf_counter())
+
+
+def _finish(context: Any) -> Optional[float]:
+    """Statement duration, added to the current request's stats."""
+    start = getattr(context, _START_ATTR, None)
+    if start is None:
+        return None
+    delattr(context, _START_ATTR)
+    duration = time.perf_counter() - start
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.record_query(duration)
+    return duration
+
+
+def _handle_error(exception_context: ExceptionContext) -> None:
+    # Failed statements still cost database time
+    _finish(exception_context.execution_context)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text, DateTime
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -14,6 +14,15 @@ class User(Base):
     is_admin = Column(Boolean, default=False, nullable=False)
     notes = relationship("Note", back_populates="owner")
 
+    __table_args__ = (
+        # Backs the admin username prefix search (LIKE 'prefix%')
+        Index(
+            "ix_users_username_prefix",
+            username,
+            postgresql_ops={"username": "text_pattern_ops"},
+        ),
+    )
+
 
 class Note(Base):
     __tablename__ = "notes"
@@ -32,6 +41,11 @@ class Note(Base):
         order_by="Plan.created_at"
     )
 
+    __table_args__ = (
+        # Backs owner-scoped lookups and the keyset order used by list_notes
+        Index("ix_notes_owner_updated_id", owner_id, updated_at.desc(), id.desc()),
+    )
+
 
 class Plan(Base):
     __tablename__ = "plans"
@@ -41,4 +55,27 @@ class Plan(Base):
     is_done = Column(Boolean, default=False, nullable=False)
     note_id = Column(Integer, ForeignKey("notes.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     note = relationship("Note", back_populates="plans")
+
+    __table_args__ = (
+        # Backs note-scoped lookups, selectinload(Note.plans) and list_plans ordering
+        Index("ix_plans_note_id_created_at", note_id, created_at),
+    )
+
+
+class Tombstone(Base):
+    """Record of a deleted note or plan, consumed by delta sync clients."""
+
+    __tablename__ = "tombstones"
+
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    entity = Column(String, nullable=False)  # "note" | "plan"
+    entity_id = Column(Integer, nullable=False)
+    note_id = Column(Integer)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_tombstones_owner_deleted_at", owner_id, deleted_at),
+    )
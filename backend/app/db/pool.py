@@ -0,0 +1,66 @@
+"""
+Connection pool instrumentation.
+
+InstrumentedPool is the regular asyncio queue pool plus metrics for how long
+requests wait for a connection and how many connections are in use.
+"""
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+from sqlalchemy.pool.base import ConnectionPoolEntry
+
+from app.core import metrics
+
+pool_checkout_seconds = metrics.histogram(
+    "notehub_db_pool_checkout_seconds",
+    "Time to check a connection out of the pool, including waiting and pre-ping.",
+    labelnames=("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+pool_checkout_timeouts = metrics.counter(
+    "notehub_db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT seconds.",
+    labelnames=("pool",),
+)
+pool_checked_out = metrics.gauge(
+    "notehub_db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    labelnames=("pool",),
+)
+pool_capacity = metrics.gauge(
+    "notehub_db_pool_capacity",
+    "Maximum connections the pool will open (pool size plus overflow).",
+    labelnames=("pool",),
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool reporting checkout latency and connections in use.
+
+    Metrics are labelled with the engine's ``pool_logging_name``.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        pool_capacity.set(self.size() + max(self._max_overflow, 0), pool=self.metrics_name)
+
+    @property
+    def metrics_name(self) -> str:
+        return str(self._orig_logging_name or "default")
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_checkout_timeouts.inc(pool=self.metrics_name)
+            raise
+        finally:
+            pool_checkout_seconds.observe(time.perf_counter() - start, pool=self.metrics_name)
+            pool_checked_out.set(self.checkedout(), pool=self.metrics_name)
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        pool_checked_out.set(self.checkedout(), pool=self.metrics_name)
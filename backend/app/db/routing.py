@@ -0,0 +1,85 @@
+"""
+Read routing between the primary and an optional read replica.
+
+Reads may go to the replica, which lags the primary slightly. To keep
+read-your-writes, a principal whose request committed a write is pinned to the
+primary for READ_AFTER_WRITE_SECONDS.
+
+Stickiness is tracked per process. With several workers behind a load balancer
+a follow-up read can land on a worker that has not seen the write; keep the
+window longer than the replica lag you expect to cover.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+
+PRIMARY = "primary"
+REPLICA = "replica"
+
+# Set by the auth dependency so commits can be attributed to the caller
+current_principal_id: ContextVar[Optional[int]] = ContextVar(
+    "current_principal_id", default=None
+)
+
+read_sessions = metrics.counter(
+    "notehub_db_read_sessions_total",
+    "Read-only sessions opened, by the engine that served them.",
+    labelnames=("target",),
+)
+
+
+class ReadAfterWrite:
+    """Bounded map of principal id -> time until which reads stay on the primary."""
+
+    def __init__(self, window_seconds: float, max_size: int = 100_000):
+        self.window_seconds = window_seconds
+        self.max_size = max_size
+        self._until: "OrderedDict[int, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, principal_id: int) -> None:
+        until = time.monotonic() + self.window_seconds
+        with self._lock:
+            self._until[principal_id] = until
+            self._until.move_to_end(principal_id)
+            while len(self._until) > self.max_size:
+                self._until.popitem(last=False)
+
+    def is_sticky(self, principal_id: int) -> bool:
+        with self._lock:
+            until = self._until.get(principal_id)
+            if until is None:
+                return False
+            if until > time.monotonic():
+                return True
+            del self._until[principal_id]
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._until.clear()
+
+
+read_after_write = ReadAfterWrite(settings.READ_AFTER_WRITE_SECONDS)
+
+
+def read_target(principal_id: int, replica_available: bool) -> str:
+    """Engine name that should serve a read for ``principal_id``."""
+    if replica_available and not read_after_write.is_sticky(principal_id):
+        return REPLICA
+    return PRIMARY
+
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session: Session, *args: Any) -> None:
+    principal_id = current_principal_id.get()
+    if principal_id is not None:
+        read_after_write.mark(principal_id)
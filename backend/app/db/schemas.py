@@ -1,8 +1,8 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Annotated, Literal, Optional, Union
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 # User schemas
@@ -21,6 +21,13 @@ class UserOut(UserBase):
     is_admin: bool = False
 
 
+class AdminUserOut(UserOut):
+    """User row in the admin listing, with aggregate counts."""
+
+    note_count: int = 0
+    plan_count: int = 0
+
+
 # Token schemas
 class Token(BaseModel):
     access_token: str
@@ -30,6 +37,8 @@ class Token(BaseModel):
 class TokenPayload(BaseModel):
     sub: str
     exp: int
+    uid: Optional[int] = None
+    adm: bool = False
 
 
 # Note schemas
@@ -57,6 +66,43 @@ class NoteOut(NoteBase):
     plans: list["PlanOut"] = []
 
 
+class NoteSummary(BaseModel):
+    """Listing row without full content or plans."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    owner_id: int
+    title: str
+    preview: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    plan_count: int
+    done_count: int
+
+
+class NoteSearchHit(BaseModel):
+    """Search result with a highlighted snippet; higher rank is a better match."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    owner_id: int
+    title: str
+    snippet: str
+    rank: float
+    created_at: datetime
+    updated_at: datetime
+
+
+NoteView = Literal["full", "summary"]
+
+# Summary rows are tried first: ORM notes lack preview/plan_count and fall through
+NoteListOut = Annotated[
+    Union[list[NoteSummary], list[NoteOut]], Field(union_mode="left_to_right")
+]
+
+
 # Plan schemas
 class PlanBase(BaseModel):
     title: str
@@ -78,3 +124,86 @@ class PlanOut(PlanBase):
     id: int
     note_id: int
     created_at: datetime
+    updated_at: datetime
+
+
+# Sync schemas
+class NoteSyncOut(NoteBase):
+    """Changed note without its plans; plan changes are listed separately."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    owner_id: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class TombstoneOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    entity: Literal["note", "plan"]
+    id: int = Field(validation_alias="entity_id")
+    note_id: Optional[int] = None
+    deleted_at: datetime
+
+
+class SyncOut(BaseModel):
+    cursor: str
+    notes: list[NoteSyncOut] = []
+    plans: list[PlanOut] = []
+    deleted: list[TombstoneOut] = []
+
+
+# Batch schemas
+MAX_BATCH_SIZE = 500
+
+
+class PlanBatchIn(BaseModel):
+    plans: list[PlanCreate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchOperation(BaseModel):
+    """One create, update or delete of a note or plan.
+
+    ``id`` identifies the row to update or delete; ``note_id`` the note a new
+    plan is created under.
+    """
+
+    op: Literal["create", "update", "delete"]
+    entity: Literal["note", "plan"]
+    id: Optional[int] = None
+    note_id: Optional[int] = None
+    title: Optional[str] = None
+    content: Optional[str] = None
+    is_done: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def check_required_fields(self) -> "BatchOperation":
+        if self.op == "create":
+            if self.title is None:
+                raise ValueError("title is required to create")
+            if self.entity == "plan" and self.note_id is None:
+                raise ValueError("note_id is required to create a plan")
+        elif self.id is None:
+            raise ValueError(f"id is required to {self.op}")
+        return self
+
+
+class BatchIn(BaseModel):
+    operations: list[BatchOperation] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchResult(BaseModel):
+    """Outcome of one operation, with an HTTP-style status code."""
+
+    status: int
+    entity: Literal["note", "plan"]
+    id: Optional[int] = None
+    note: Optional[NoteSyncOut] = None
+    plan: Optional[PlanOut] = None
+    detail: Optional[str] = None
+
+
+class BatchOut(BaseModel):
+    results: list[BatchResult]
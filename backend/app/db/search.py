@@ -0,0 +1,123 @@
+"""
+Full-text search over notes.
+
+The search index lives outside the ORM models and is maintained by database
+triggers installed in migration 0004:
+
+* PostgreSQL: ``notes.search_vector`` (weighted ``tsvector``) with a GIN index,
+  ranked with ``ts_rank`` and highlighted with ``ts_headline``.
+* SQLite: the FTS5 table ``notes_fts`` (rowid = note id), ranked with ``bm25``
+  and highlighted with ``snippet``.
+
+Both index the note title, content and the titles of its plans.
+"""
+import re
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import DateTime, Float, Integer, String, text
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+# Schema objects created by migration 0004 that are not declared in the models
+FTS_TABLE = "notes_fts"
+SEARCH_VECTOR_COLUMN = "search_vector"
+SEARCH_VECTOR_INDEX = "ix_notes_search_vector"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_RESULT_COLUMNS: dict[str, Any] = {
+    "id": Integer,
+    "owner_id": Integer,
+    "title": String,
+    "snippet": String,
+    "rank": Float,
+    "created_at": DateTime(timezone=True),
+    "updated_at": DateTime(timezone=True),
+}
+
+_SQLITE_SEARCH = text(
+    f"""
+    SELECT n.id, n.owner_id, n.title,
+           snippet({FTS_TABLE}, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '…', 16)
+               AS snippet,
+           -bm25({FTS_TABLE}, 10.0, 4.0, 1.0) AS rank,
+           n.created_at, n.updated_at
+    FROM {FTS_TABLE}
+    JOIN notes n ON n.id = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH :query AND n.owner_id = :owner_id
+    ORDER BY rank DESC, n.id DESC
+    LIMIT :limit OFFSET :offset
+    """
+).columns(**_RESULT_COLUMNS)
+
+# Rank and page first, so ts_headline only runs for the rows that are returned
+_POSTGRES_SEARCH = text(
+    f"""
+    WITH q AS (SELECT websearch_to_tsquery('simple', :query) AS query),
+    hits AS (
+        SELECT n.id, ts_rank(n.{SEARCH_VECTOR_COLUMN}, q.query) AS rank
+        FROM notes n, q
+        WHERE n.owner_id = :owner_id AND n.{SEARCH_VECTOR_COLUMN} @@ q.query
+        ORDER BY rank DESC, n.id DESC
+        LIMIT :limit OFFSET :offset
+    )
+    SELECT n.id, n.owner_id, n.title,
+           ts_headline(
+               'simple', n.title || ' ' || coalesce(n.content, ''), q.query,
+               'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, '
+               'MaxWords=32, MinWords=8, MaxFragments=2'
+           ) AS snippet,
+           hits.rank, n.created_at, n.updated_at
+    FROM hits JOIN notes n ON n.id = hits.id, q
+    ORDER BY hits.rank DESC, n.id DESC
+    """
+).columns(**_RESULT_COLUMNS)
+
+
+def fts5_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 expression matching all of its words.
+
+    Every word is quoted, so FTS5 operators and syntax characters in user input
+    are matched literally instead of raising a syntax error.
+    """
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"' for token in tokens)
+
+
+def is_search_object(name: Optional[str], type_: str) -> bool:
+    """Whether a reflected schema object belongs to the search index.
+
+    Used to keep these unmapped objects out of Alembic autogenerate comparisons.
+    """
+    if name is None:
+        return False
+    if type_ == "table":
+        return name == FTS_TABLE or name.startswith(FTS_TABLE + "_")
+    if type_ == "column":
+        return name == SEARCH_VECTOR_COLUMN
+    if type_ == "index":
+        return name == SEARCH_VECTOR_INDEX
+    return False
+
+
+async def search_notes(
+    db: AsyncSession, owner_id: int, query: str, *, limit: int, offset: int = 0
+) -> Sequence[Row]:
+    """Rank the owner's notes against ``query``, best match first."""
+    dialect = db.get_bind().dialect.name
+    params = {"owner_id": owner_id, "limit": limit, "offset": offset}
+    if dialect == "sqlite":
+        match = fts5_query(query)
+        if match is None:
+            return []
+        res = await db.execute(_SQLITE_SEARCH, {**params, "query": match})
+    elif dialect == "postgresql":
+        res = await db.execute(_POSTGRES_SEARCH, {**params, "query": query})
+    else:
+        raise NotImplementedError(f"Full-text search is not supported on {dialect}")
+    return res.all()
@@ -0,0 +1,119 @@
+"""
+Slow-query log.
+
+Statements that take at least ``SLOW_QUERY_SECONDS`` are logged to the
+``notehub.slow_query`` logger as one JSON object per line: duration, the
+statement with its placeholders, redacted parameters (types only) and the
+route being served. With ``DEBUG`` on, the entry also carries the query plan:
+``EXPLAIN (ANALYZE, BUFFERS)`` for SELECTs on PostgreSQL (plain ``EXPLAIN``
+for writes, which ANALYZE would run a second time) and ``EXPLAIN QUERY PLAN``
+on SQLite.
+
+The plan is captured on a separate cursor of the same connection, inside a
+savepoint on PostgreSQL so a failing EXPLAIN cannot abort the transaction.
+"""
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.engine import Connection
+
+from app.core import metrics
+from app.core.timing import current_request_stats
+
+logger = logging.getLogger("notehub.slow_query")
+
+MAX_STATEMENT_LENGTH = 4000
+
+slow_queries = metrics.counter(
+    "notehub_db_slow_queries_total",
+    "Statements slower than SLOW_QUERY_SECONDS, by route.",
+    labelnames=("route",),
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Parameter types in place of values, e.g. ``["int", "str"]``."""
+    if executemany:
+        return {"rows": len(parameters)}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _explain_prefix(dialect: str, statement: str) -> Optional[str]:
+    if dialect == "sqlite":
+        return "EXPLAIN QUERY PLAN "
+    if dialect == "postgresql":
+        is_select = statement.lstrip().upper().startswith(("SELECT", "WITH"))
+        return "EXPLAIN (ANALYZE, BUFFERS) " if is_select else "EXPLAIN "
+    return None
+
+
+def explain(conn: Connection, statement: str, parameters: Any) -> List[str]:
+    """Query plan of ``statement``, one line per row of EXPLAIN output."""
+    dialect = conn.dialect.name
+    prefix = _explain_prefix(dialect, statement)
+    if prefix is None:
+        return []
+    cursor = conn.connection.cursor()
+    savepoint = dialect == "postgresql"
+    try:
+        if savepoint:
+            cursor.execute("SAVEPOINT notehub_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT notehub_explain")
+            raise
+        if savepoint:
+            cursor.execute("RELEASE SAVEPOINT notehub_explain")
+        return [" | ".join(str(col) for col in row) for row in rows]
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    """Log statements that take at least ``threshold`` seconds."""
+
+    def __init__(self, threshold: float, explain: bool = False) -> None:
+        self.threshold = threshold
+        self.explain = explain
+
+    def observe(
+        self,
+        conn: Connection,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        duration: float,
+    ) -> None:
+        if duration < self.threshold:
+            return
+        stats = current_request_stats.get()
+        route = stats.route if stats is not None else None
+        slow_queries.inc(route=route or "none")
+
+        entry: Dict[str, Any] = {
+            "event": "slow_query",
+            "duration_ms": round(duration * 1000, 3),
+            "threshold_ms": round(self.threshold * 1000, 3),
+            "route": route,
+            "method": stats.method if stats is not None else None,
+            "database": conn.dialect.name,
+            "statement": _WHITESPACE.sub(" ", statement).strip()[:MAX_STATEMENT_LENGTH],
+            "parameters": redact_parameters(parameters, executemany),
+        }
+        if self.explain and not executemany:
+            try:
+                entry["plan"] = explain(conn, statement, parameters)
+            except Exception as exc:  # the log entry matters more than the plan
+                entry["plan_error"] = f"{type(exc).__name__}: {exc}"
+        logger.warning(json.dumps(entry, default=str))
@@ -1,25 +1,50 @@
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Dict
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api.admin import router as admin_router
 from app.api.auth import router as auth_router
+from app.api.batch import router as batch_router
 from app.api.notes import router as notes_router
+from app.api.etag import ETAG_HEADER
+from app.api.fast_json import ORJSONResponse
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.api.plans import router as plans_router
+from app.api.sync import router as sync_router
 from app.api.users import router as users_router
+from app.core import metrics
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.db.base import init_db
+from app.core.hashing import password_hasher
+from app.core.timing import SERVER_TIMING_HEADER, TimingMiddleware
+from app.db.base import engines, get_database_url, init_db
+from app.db.routing import REPLICA
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:  # noqa: F811, ARG001
+    # Tests may configure the engines beforehand to point at their own database
+    if not engines.is_configured():
+        engines.configure(get_database_url())
+    if settings.DATABASE_REPLICA_URL and not engines.is_configured(REPLICA):
+        engines.configure(settings.DATABASE_REPLICA_URL, name=REPLICA)
     await init_db()
     yield
+    await engines.dispose()
+    # Waits for in-flight hashes without blocking the event loop
+    await asyncio.to_thread(password_hasher.shutdown)
 
 
-app = FastAPI(title=settings.API_TITLE, version=settings.API_VERSION, lifespan=lifespan)
+app = FastAPI(
+    title=settings.API_TITLE,
+    version=settings.API_VERSION,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if settings.FAST_JSON else JSONResponse,
+)
 
 # CORS configuration for frontend integration
 # In production, replace origins with specific domains via CORS_ORIGINS environment variable
@@ -30,13 +55,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # GET, POST, PUT, DELETE, etc.
     allow_headers=["*"],  # Authorization, Content-Type, etc.
+    # Let browsers read cursors, ETags and timings
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER, SERVER_TIMING_HEADER],
 )
 
+# Wraps CORS so every response body is compressed
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        level=settings.COMPRESSION_LEVEL,
+    )
+
+# Outermost, so latency includes every other middleware
+app.add_middleware(TimingMiddleware)
+
 app.include_router(users_router)
 app.include_router(notes_router)
 app.include_router(auth_router)
 app.include_router(plans_router)
 app.include_router(admin_router)
+app.include_router(sync_router)
+app.include_router(batch_router)
 
 
 @app.get("/")
@@ -47,3 +87,9 @@ def root() -> Dict[str, str]:
 @app.get("/health")
 def health_check() -> Dict[str, str]:
     return {"status": "healthy", "service": "NoteHub API"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    """Expose in-process metrics in the Prometheus text format."""
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,185 @@
+"""
+Query-plan benchmark for the hot-path indexes (migration 0002).
+
+Seeds a database at the baseline revision, captures the query plan and median
+latency of the hot queries, upgrades to head and measures again.
+
+Usage:
+    python benchmarks/index_plans.py                      # temporary SQLite file
+    python benchmarks/index_plans.py --users 200 --notes-per-user 500
+    DATABASE_URL=postgresql+asyncpg://... python benchmarks/index_plans.py
+
+Against Postgres the target database must be empty; it is downgraded to
+``base`` when the run finishes.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from alembic import command  # noqa: E402
+from sqlalchemy import insert, select, text  # noqa: E402
+from sqlalchemy.engine import Connection  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine  # noqa: E402
+
+from app.db import models  # noqa: E402
+from app.db.base import get_alembic_config  # noqa: E402
+
+BATCH_SIZE = 5000
+
+
+def migrate(connection: Connection, revision: str) -> None:
+    config = get_alembic_config()
+    config.attributes["connection"] = connection
+    if revision == "base":
+        command.downgrade(config, "base")
+    else:
+        command.upgrade(config, revision)
+
+
+async def seed(conn: AsyncConnection, args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    users = [
+        {"id": i, "username": f"user{i}", "password_hash": "x", "is_admin": False}
+        for i in range(1, args.users + 1)
+    ]
+    await conn.execute(insert(models.User), users)
+
+    notes: List[Dict[str, Any]] = []
+    plans: List[Dict[str, Any]] = []
+    note_id = plan_id = 0
+    for user in users:
+        for _ in range(args.notes_per_user):
+            note_id += 1
+            notes.append(
+                {"id": note_id, "title": f"Note {note_id}", "content": "x" * rng.randint(0, 200),
+                 "owner_id": user["id"]}
+            )
+            for _ in range(args.plans_per_note):
+                plan_id += 1
+                plans.append(
+                    {"id": plan_id, "title": f"Plan {plan_id}", "is_done": rng.random() < 0.5,
+                     "note_id": note_id}
+                )
+    # Shuffle so rows of one owner/note are not physically adjacent
+    rng.shuffle(notes)
+    rng.shuffle(plans)
+    for table, rows in ((models.Note, notes), (models.Plan, plans)):
+        for start in range(0, len(rows), BATCH_SIZE):
+            await conn.execute(insert(table), rows[start:start + BATCH_SIZE])
+
+
+def hot_queries(args: argparse.Namespace) -> Dict[str, Any]:
+    owner_id = args.users // 2 or 1
+    note_id = args.notes_per_user * (owner_id - 1) + 1
+    note_ids = list(range(note_id, note_id + min(args.notes_per_user, 50)))
+    return {
+        "list_notes": select(models.Note)
+        .where(models.Note.owner_id == owner_id)
+        .order_by(models.Note.updated_at.desc(), models.Note.id.desc())
+        .limit(50),
+        "get_note": select(models.Note).where(
+            models.Note.id == note_id, models.Note.owner_id == owner_id
+        ),
+        "selectin_plans": select(models.Plan)
+        .where(models.Plan.note_id.in_(note_ids))
+        .order_by(models.Plan.created_at),
+        "list_plans": select(models.Plan)
+        .where(models.Plan.note_id == note_id)
+        .order_by(models.Plan.created_at),
+    }
+
+
+async def measure(conn: AsyncConnection, args: argparse.Namespace) -> Dict[str, Any]:
+    dialect = conn.dialect
+    explain = "EXPLAIN QUERY PLAN " if dialect.name == "sqlite" else "EXPLAIN (ANALYZE, BUFFERS) "
+    if dialect.name == "postgresql":
+        await conn.execute(text("ANALYZE"))
+
+    results: Dict[str, Any] = {}
+    for name, stmt in hot_queries(args).items():
+        sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+        plan_rows = (await conn.execute(text(explain + sql))).all()
+        plan = [" | ".join(str(col) for col in row) for row in plan_rows]
+
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            (await conn.execute(stmt)).all()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = {"median_ms": round(statistics.median(timings), 3), "plan": plan}
+    return results
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    url = args.database_url
+    engine = create_async_engine(url)
+    report: Dict[str, Any] = {
+        "database": engine.dialect.name,
+        "users": args.users,
+        "notes": args.users * args.notes_per_user,
+        "plans": args.users * args.notes_per_user * args.plans_per_note,
+    }
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(migrate, "0001")
+            start = time.perf_counter()
+            await seed(conn, args)
+            report["seed_seconds"] = round(time.perf_counter() - start, 2)
+
+        async with engine.connect() as conn:
+            report["before"] = await measure(conn, args)
+        async with engine.begin() as conn:
+            await conn.run_sync(migrate, "0002")
+        async with engine.connect() as conn:
+            report["after"] = await measure(conn, args)
+    finally:
+        if engine.dialect.name != "sqlite":
+            async with engine.begin() as conn:
+                await conn.run_sync(migrate, "base")
+        await engine.dispose()
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{report['database']}: {report['users']} users, {report['notes']} notes, "
+        f"{report['plans']} plans (seeded in {report['seed_seconds']}s)\n"
+    )
+    for name, before in report["before"].items():
+        after = report["after"][name]
+        print(f"== {name}: {before['median_ms']} ms -> {after['median_ms']} ms")
+        print("   before: " + "\n           ".join(before["plan"]))
+        print("   after:  " + "\n           ".join(after["plan"]))
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--notes-per-user", type=int, default=200)
+    parser.add_argument("--plans-per-note", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="print the raw JSON report")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.database_url or args.database_url.startswith("sqlite"):
+            args.database_url = f"sqlite+aiosqlite:///{tmp}/index_plans.db"
+        result = asyncio.run(main(args))
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
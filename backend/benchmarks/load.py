@@ -0,0 +1,387 @@
+"""
+Load-testing harness for the NoteHub API.
+
+Seeds users, notes and plans through the API, then runs concurrent virtual
+users issuing a weighted mix of the desktop client's hot operations:
+
+- ``list``: first page of note summaries (GET /notes?view=summary&limit=50)
+- ``open``: one note with its plans (GET /notes/{id})
+- ``toggle``: flip a plan (PUT /notes/{id}/plans/{plan_id})
+- ``save``: edit a note's content (PUT /notes/{id})
+
+The report gives count, errors, throughput and p50/p95/p99 latency per
+operation as JSON, so runs from two commits can be diffed with ``compare``.
+
+By default the app runs in-process against a temporary SQLite file, which
+measures the application code without network or server overhead. Pass
+``--base-url`` to load a running server (uvicorn, Docker, Render) instead.
+
+Usage:
+    python benchmarks/load.py run --output head.json
+    python benchmarks/load.py run --mix write-heavy --concurrency 32 --duration 30
+    python benchmarks/load.py run --base-url http://localhost:8000 --users 20
+    python benchmarks/load.py compare base.json head.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+BATCH_SIZE = 500  # MAX_BATCH_SIZE of POST /batch
+PASSWORD = "bench-password"
+
+MIXES: Dict[str, Dict[str, int]] = {
+    "read-heavy": {"list": 50, "open": 35, "toggle": 10, "save": 5},
+    "balanced": {"list": 30, "open": 30, "toggle": 20, "save": 20},
+    "write-heavy": {"list": 10, "open": 20, "toggle": 35, "save": 35},
+}
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi aliquip ex ea commodo consequat"
+).split()
+
+
+class VirtualUser:
+    """A seeded account and the ids of its notes and plans."""
+
+    def __init__(self, headers: Dict[str, str], plans_by_note: Dict[int, List[int]]):
+        self.headers = headers
+        self.plans_by_note = plans_by_note
+        self.note_ids = list(plans_by_note)
+
+
+@asynccontextmanager
+async def open_client(args: argparse.Namespace) -> AsyncIterator[httpx.AsyncClient]:
+    """Client for ``--base-url``, or for the app served in-process."""
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    if args.base_url:
+        async with httpx.AsyncClient(
+            base_url=args.base_url, timeout=timeout, limits=limits
+        ) as client:
+            yield client
+        return
+
+    from asgi_lifespan import LifespanManager
+
+    from app.main import app
+
+    async with LifespanManager(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=timeout
+        ) as client:
+            yield client
+
+
+def check(response: httpx.Response) -> httpx.Response:
+    if response.status_code >= 400:
+        raise RuntimeError(
+            f"{response.request.method} {response.request.url.path}: "
+            f"{response.status_code} {response.text[:200]}"
+        )
+    return response
+
+
+async def seed_user(
+    client: httpx.AsyncClient, username: str, args: argparse.Namespace, rng: random.Random
+) -> VirtualUser:
+    r = await client.post("/auth/register", json={"username": username, "password": PASSWORD})
+    if r.status_code not in (200, 400):  # 400: already registered by an earlier run
+        check(r)
+    r = check(await client.post(
+        "/auth/login",
+        data={"username": username, "password": PASSWORD},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    ))
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    creates = [
+        {"op": "create", "entity": "note", "title": f"{username} note {i}",
+         "content": " ".join(rng.choices(WORDS, k=rng.randint(20, 200)))}
+        for i in range(args.notes_per_user)
+    ]
+    note_ids = [
+        result["id"] for result in await run_batches(client, headers, creates)
+    ]
+    creates = [
+        {"op": "create", "entity": "plan", "note_id": note_id, "title": f"Plan {j}",
+         "is_done": rng.random() < 0.3}
+        for note_id in note_ids
+        for j in range(args.plans_per_note)
+    ]
+    plans_by_note: Dict[int, List[int]] = {note_id: [] for note_id in note_ids}
+    for result in await run_batches(client, headers, creates):
+        plans_by_note[result["plan"]["note_id"]].append(result["id"])
+    return VirtualUser(headers, plans_by_note)
+
+
+async def run_batches(
+    client: httpx.AsyncClient, headers: Dict[str, str], operations: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for start in range(0, len(operations), BATCH_SIZE):
+        r = check(await client.post(
+            "/batch", json={"operations": operations[start:start + BATCH_SIZE]}, headers=headers
+        ))
+        results.extend(r.json()["results"])
+    return results
+
+
+async def seed(client: httpx.AsyncClient, args: argparse.Namespace) -> List[VirtualUser]:
+    rng = random.Random(args.seed)
+    # Registration is bcrypt-bound, so seed a few users at a time
+    semaphore = asyncio.Semaphore(8)
+
+    async def one(i: int) -> VirtualUser:
+        async with semaphore:
+            return await seed_user(client, f"{args.user_prefix}{i}", args, random.Random(rng.random()))
+
+    return await asyncio.gather(*(one(i) for i in range(args.users)))
+
+
+async def perform(
+    client: httpx.AsyncClient, operation: str, user: VirtualUser, rng: random.Random
+) -> httpx.Response:
+    note_id = rng.choice(user.note_ids) if user.note_ids else None
+    if operation == "list" or note_id is None:
+        return await client.get(
+            "/notes", params={"view": "summary", "limit": 50}, headers=user.headers
+        )
+    if operation == "open":
+        return await client.get(f"/notes/{note_id}", headers=user.headers)
+    if operation == "toggle" and user.plans_by_note[note_id]:
+        plan_id = rng.choice(user.plans_by_note[note_id])
+        return await client.put(
+            f"/notes/{note_id}/plans/{plan_id}",
+            json={"is_done": rng.random() < 0.5},
+            headers=user.headers,
+        )
+    return await client.put(
+        f"/notes/{note_id}",
+        json={"content": " ".join(rng.choices(WORDS, k=rng.randint(20, 200)))},
+        headers=user.headers,
+    )
+
+
+async def load(
+    client: httpx.AsyncClient, users: List[VirtualUser], args: argparse.Namespace
+) -> Dict[str, Any]:
+    mix = MIXES[args.mix]
+    operations, weights = list(mix), list(mix.values())
+    samples: Dict[str, List[float]] = {name: [] for name in operations}
+    errors: Dict[str, int] = {name: 0 for name in operations}
+    deadline = time.perf_counter() + args.duration
+    remaining = args.requests
+
+    async def worker(index: int) -> None:
+        nonlocal remaining
+        rng = random.Random(args.seed * 1000 + index)
+        user = users[index % len(users)]
+        while time.perf_counter() < deadline:
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+            operation = rng.choices(operations, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await perform(client, operation, user, rng)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            elapsed = time.perf_counter() - start
+            if failed:
+                errors[operation] += 1
+            else:
+                samples[operation].append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    wall = time.perf_counter() - started
+
+    endpoints = {
+        name: summarize(samples[name], errors[name], wall) for name in operations
+    }
+    all_samples = [value for values in samples.values() for value in values]
+    endpoints["total"] = summarize(all_samples, sum(errors.values()), wall)
+    return {"wall_seconds": round(wall, 3), "endpoints": endpoints}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil without float drift
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(values: List[float], errors: int, wall: float) -> Dict[str, Any]:
+    values = sorted(values)
+    ms = [v * 1000 for v in values]
+    return {
+        "count": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / wall, 2) if wall else 0.0,
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(ms[-1], 3) if ms else 0.0,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    async with open_client(args) as client:
+        start = time.perf_counter()
+        users = await seed(client, args)
+        seed_seconds = time.perf_counter() - start
+        if args.warmup:
+            warmup = argparse.Namespace(**{**vars(args), "requests": args.warmup})
+            await load(client, users, warmup)
+        result = await load(client, users, args)
+
+    return {
+        "revision": git_revision(),
+        "target": args.base_url or "in-process",
+        "mix": args.mix,
+        "concurrency": args.concurrency,
+        "users": args.users,
+        "notes_per_user": args.notes_per_user,
+        "plans_per_note": args.plans_per_note,
+        "seed": args.seed,
+        "seed_seconds": round(seed_seconds, 2),
+        **result,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{report['target']} @ {report['revision']}: mix={report['mix']} "
+        f"concurrency={report['concurrency']} wall={report['wall_seconds']}s\n"
+    )
+    print(f"{'endpoint':>8} {'count':>7} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, stats in report["endpoints"].items():
+        print(
+            f"{name:>8} {stats['count']:>7} {stats['errors']:>4} {stats['throughput_rps']:>8} "
+            f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8}"
+        )
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any]) -> Dict[str, Any]:
+    """Relative change of every metric, per endpoint (negative ms is faster)."""
+    diff: Dict[str, Any] = {}
+    for name, head_stats in head["endpoints"].items():
+        base_stats = base["endpoints"].get(name)
+        if base_stats is None:
+            continue
+        diff[name] = {
+            key: {
+                "base": base_stats[key],
+                "head": head_stats[key],
+                "change_pct": round((head_stats[key] - base_stats[key]) / base_stats[key] * 100, 1)
+                if base_stats[key] else None,
+            }
+            for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "errors")
+        }
+    mismatched = [
+        key for key in ("target", "mix", "concurrency", "users", "notes_per_user", "plans_per_note")
+        if base.get(key) != head.get(key)
+    ]
+    return {
+        "base": base.get("revision"),
+        "head": head.get("revision"),
+        "mismatched": mismatched,
+        "endpoints": diff,
+    }
+
+
+def print_comparison(diff: Dict[str, Any]) -> None:
+    print(f"{diff['base']} -> {diff['head']}")
+    if diff["mismatched"]:
+        print("warning: runs differ in " + ", ".join(diff["mismatched"]))
+    print()
+    for name, metrics in diff["endpoints"].items():
+        cells = []
+        for key, value in metrics.items():
+            change = value["change_pct"]
+            suffix = f" ({change:+.1f}%)" if change is not None else ""
+            cells.append(f"{key}={value['head']}{suffix}")
+        print(f"{name:>8}: " + "  ".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="seed and run a load test")
+    run_parser.add_argument("--base-url", help="load a running server instead of in-process")
+    run_parser.add_argument("--mix", choices=sorted(MIXES), default="read-heavy")
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    run_parser.add_argument("--requests", type=int, help="stop after this many requests")
+    run_parser.add_argument("--warmup", type=int, default=100, help="unmeasured requests first")
+    run_parser.add_argument("--users", type=int, default=8)
+    run_parser.add_argument("--notes-per-user", type=int, default=100)
+    run_parser.add_argument("--plans-per-note", type=int, default=5)
+    run_parser.add_argument("--user-prefix", default="bench")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--timeout", type=float, default=30.0)
+    run_parser.add_argument("--output", help="write the JSON report to this file")
+    run_parser.add_argument("--json", action="store_true", help="print the raw JSON report")
+
+    compare_parser = subparsers.add_parser("compare", help="diff two JSON reports")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--json", action="store_true", help="print the raw JSON diff")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        diff = compare(json.loads(Path(args.base).read_text()), json.loads(Path(args.head).read_text()))
+        if args.json:
+            print(json.dumps(diff, indent=2))
+        else:
+            print_comparison(diff)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.base_url:
+            # Must be set before app.main is imported by open_client
+            os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/load.db"
+        report = asyncio.run(run(args))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
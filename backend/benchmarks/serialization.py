@@ -0,0 +1,110 @@
+"""
+Serialization benchmark for the FAST_JSON response path.
+
+Builds in-memory notes with plans and times the two ways a listing can be
+turned into a response body:
+
+- ``response_model``: validate the ORM objects into ``list[NoteOut]`` with
+  ``from_attributes`` and dump to JSON, as FastAPI does by default;
+- ``fast_json``: build dicts with ``app.api.fast_json.note_out`` and render
+  them with ``ORJSONResponse`` (orjson, or the stdlib encoder without it).
+
+Usage:
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --notes 500 --plans-per-note 10 --json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.api import fast_json  # noqa: E402
+from app.db import models  # noqa: E402
+from app.db.schemas import NoteOut  # noqa: E402
+
+
+def build_notes(args: argparse.Namespace) -> List[models.Note]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    notes = []
+    plan_id = 0
+    for note_id in range(1, args.notes + 1):
+        stamp = start + timedelta(seconds=note_id, microseconds=note_id)
+        plans = []
+        for _ in range(args.plans_per_note):
+            plan_id += 1
+            plans.append(models.Plan(
+                id=plan_id, title=f"Plan {plan_id}", is_done=plan_id % 2 == 0,
+                note_id=note_id, created_at=stamp, updated_at=stamp,
+            ))
+        notes.append(models.Note(
+            id=note_id, title=f"Note {note_id}", content="x" * 200, owner_id=1,
+            created_at=stamp, updated_at=stamp, plans=plans,
+        ))
+    return notes
+
+
+def time_it(fn: Callable[[], bytes], repeat: int) -> Dict[str, Any]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(timings), 3), "bytes": len(body)}
+
+
+def main(args: argparse.Namespace) -> Dict[str, Any]:
+    notes = build_notes(args)
+    adapter = TypeAdapter(List[NoteOut])
+
+    def response_model() -> bytes:
+        return adapter.dump_json(adapter.validate_python(notes, from_attributes=True))
+
+    def fast() -> bytes:
+        return fast_json.ORJSONResponse([fast_json.note_out(note) for note in notes]).body
+
+    if json.loads(response_model()) != json.loads(fast()):
+        raise SystemExit("fast_json output differs from response_model output")
+
+    report: Dict[str, Any] = {
+        "notes": args.notes,
+        "plans": args.notes * args.plans_per_note,
+        "orjson": fast_json.orjson is not None,
+        "response_model": time_it(response_model, args.repeat),
+        "fast_json": time_it(fast, args.repeat),
+    }
+    report["speedup"] = round(
+        report["response_model"]["median_ms"] / report["fast_json"]["median_ms"], 2
+    )
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    encoder = "orjson" if report["orjson"] else "stdlib json"
+    print(f"{report['notes']} notes, {report['plans']} plans ({encoder})\n")
+    for name in ("response_model", "fast_json"):
+        result = report[name]
+        print(f"{name:>15}: {result['median_ms']:>9} ms  {result['bytes']} bytes")
+    print(f"\nspeedup: {report['speedup']}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--notes", type=int, default=200)
+    parser.add_argument("--plans-per-note", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="print the raw JSON report")
+    args = parser.parse_args()
+
+    result = main(args)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
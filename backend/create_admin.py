@@ -9,7 +9,7 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.db.base import SessionLocal
+from app.db.base import engines, get_database_url
 from app.db import crud
 
 
@@ -18,7 +18,15 @@ async def create_admin():
     username = input("Enter admin username (default: admin): ").strip() or "admin"
     password = input("Enter admin password (default: admin123): ").strip() or "admin123"
     
-    async with SessionLocal() as db:
+    engines.configure(get_database_url())
+    try:
+        await _create_admin(username, password)
+    finally:
+        await engines.dispose()
+
+
+async def _create_admin(username: str, password: str) -> None:
+    async with engines.session_maker()() as db:
         # Check if user exists
         existing_user = await crud.get_user_by_username(db, username)
         if existing_user:
@@ -0,0 +1,365 @@
+"""
+Bulk data seeder for benchmarks and staging.
+
+Generates users, notes and plans with realistic size distributions and loads
+them in large batches: ``COPY`` (asyncpg ``copy_records_to_table``) on
+PostgreSQL, ``executemany`` on SQLite. The schema is migrated first; ids are
+assigned by the seeder, continuing after the existing rows, and the Postgres
+sequences are moved past them at the end.
+
+Distributions (means are set on the command line):
+- notes per user and plans per note are exponential, so most users have a
+  few notes and a handful are heavy users;
+- note content length is log-normal (median ~400 characters, capped at
+  20,000); one note in ten has no content;
+- timestamps are spread over the year before ``--as-of`` (default: today,
+  midnight UTC), at whole seconds like the server defaults.
+
+The full-text search triggers recompute a note's index entry for every plan
+inserted, which would dominate the load. They are suspended while seeding and
+the index is rebuilt for the new notes in one set-based statement at the end.
+
+The same ``--seed`` and ``--as-of`` always produce the same data. Every seeded user has the
+password given by ``--password``, hashed once.
+
+Usage:
+    python seed_data.py --users 1000
+    python seed_data.py --users 100000 --notes-per-user 20 --plans-per-note 4
+    DATABASE_URL=postgresql+asyncpg://... python seed_data.py --users 500000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.base import engines, get_database_url, init_db
+from app.db.search import FTS_TABLE, SEARCH_VECTOR_COLUMN
+
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "users": ("id", "username", "password_hash", "is_admin"),
+    "notes": ("id", "title", "content", "owner_id", "created_at", "updated_at"),
+    "plans": ("id", "title", "is_done", "note_id", "created_at", "updated_at"),
+}
+
+# Search triggers from migration 0004, suspended while loading
+SQLITE_SEARCH_TRIGGERS = ("notes_fts_insert", "plans_fts_insert")
+POSTGRES_SEARCH_TRIGGERS = {"notes": "notes_search_update", "plans": "plans_search_update"}
+
+MAX_CONTENT_LENGTH = 20_000
+TEXT_POOL_SIZE = 2_000_000
+
+WORDS = (
+    "the of and to in is you that it he was for on are as with his they at be this "
+    "have from or one had by word but not what all were we when your can said there "
+    "use an each which she do how their if will up other about out many then them "
+    "these so some her would make like him into time has look two more write go see "
+    "number no way could people my than first water been call who oil its now find "
+    "meeting agenda review draft release budget plan milestone feedback design client "
+    "deadline follow-up invoice backlog sprint retro ideas groceries travel workout"
+).split()
+
+
+class Generator:
+    """Deterministic rows for one run; ids continue from ``start_ids``."""
+
+    def __init__(self, args: argparse.Namespace, start_ids: Dict[str, int], dialect: str):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.next_id = dict(start_ids)
+        self.password_hash = get_password_hash(args.password)
+        self.now = args.as_of
+        self.as_text = dialect == "sqlite"
+        # Slicing one long random text is much faster than joining words per note
+        pool: List[str] = []
+        length = 0
+        while length < TEXT_POOL_SIZE:
+            word = self.rng.choice(WORDS)
+            pool.append(word)
+            length += len(word) + 1
+        self.pool = " ".join(pool)
+
+    def _id(self, table: str) -> int:
+        self.next_id[table] += 1
+        return self.next_id[table]
+
+    def _text(self, length: int) -> str:
+        """About ``length`` characters of whole words."""
+        start = self.pool.find(" ", self.rng.randrange(0, len(self.pool) - length - 64)) + 1
+        end = self.pool.rfind(" ", start, start + length + 1)
+        return self.pool[start:end if end > start else start + length]
+
+    def _title(self) -> str:
+        return self._text(self.rng.randint(8, 48)).capitalize() or "Untitled"
+
+    def _content(self) -> Optional[str]:
+        if self.rng.random() < 0.1:
+            return None
+        length = int(self.rng.lognormvariate(6.0, 1.0))  # median e^6 ~ 400
+        return self._text(max(1, min(length, MAX_CONTENT_LENGTH)))
+
+    def _between(self, earliest: datetime) -> datetime:
+        span = max(1, int((self.now - earliest).total_seconds()))
+        return earliest + timedelta(seconds=self.rng.randrange(span))
+
+    def _timestamps(self, after: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+        """Creation within the past year (or after ``after``), then an update."""
+        created = self._between(after or self.now - timedelta(days=365))
+        return created, self._between(created)
+
+    def _value(self, timestamp: datetime) -> Any:
+        # SQLite stores server defaults as text; asyncpg COPY wants datetimes
+        return timestamp.strftime("%Y-%m-%d %H:%M:%S") if self.as_text else timestamp
+
+    def _count(self, mean: float) -> int:
+        return int(self.rng.expovariate(1 / mean) + 0.5) if mean > 0 else 0
+
+    def batches(self) -> Iterator[Tuple[str, List[tuple]]]:
+        """``(table, rows)`` batches, parents always before their children."""
+        size = self.args.batch_size
+        notes: List[tuple] = []
+        plans: List[tuple] = []
+        for first in range(0, self.args.users, size):
+            users = []
+            for _ in range(min(size, self.args.users - first)):
+                user_id = self._id("users")
+                users.append(
+                    (user_id, f"{self.args.username_prefix}{user_id}", self.password_hash, False)
+                )
+            yield "users", users
+
+            for user in users:
+                for _ in range(self._count(self.args.notes_per_user)):
+                    note_id = self._id("notes")
+                    created, updated = self._timestamps()
+                    notes.append((
+                        note_id, self._title(), self._content(), user[0],
+                        self._value(created), self._value(updated),
+                    ))
+                    for _ in range(self._count(self.args.plans_per_note)):
+                        plan_created, plan_updated = self._timestamps(after=created)
+                        plans.append((
+                            self._id("plans"), self._title(), self.rng.random() < 0.4,
+                            note_id, self._value(plan_created), self._value(plan_updated),
+                        ))
+                    if len(notes) >= size:
+                        yield "notes", notes
+                        notes = []
+                    if len(plans) >= size:
+                        # Their notes may still be buffered
+                        if notes:
+                            yield "notes", notes
+                            notes = []
+                        yield "plans", plans
+                        plans = []
+            if notes:
+                yield "notes", notes
+                notes = []
+            if plans:
+                yield "plans", plans
+                plans = []
+
+
+class Progress:
+    """Rows written so far, reported on stderr."""
+
+    def __init__(self, expected: int, quiet: bool = False):
+        self.expected = expected
+        self.quiet = quiet
+        self.counts: Dict[str, int] = {table: 0 for table in COLUMNS}
+        self.start = time.perf_counter()
+        self._last_report = 0.0
+
+    def add(self, table: str, rows: int) -> None:
+        self.counts[table] += rows
+        now = time.perf_counter()
+        if not self.quiet and now - self._last_report >= 1.0:
+            self._last_report = now
+            self.report(end="\r")
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def report(self, end: str = "\n") -> None:
+        elapsed = time.perf_counter() - self.start
+        rate = self.total / elapsed if elapsed else 0.0
+        detail = ", ".join(f"{table} {count:,}" for table, count in self.counts.items())
+        print(
+            f"{self.total:,}/~{self.expected:,} rows ({detail}) "
+            f"{elapsed:.0f}s, {rate:,.0f} rows/s   ",
+            end=end, file=sys.stderr, flush=True,
+        )
+
+
+class SqliteWriter:
+    """Batched ``executemany`` inserts, one transaction per batch."""
+
+    def __init__(self) -> None:
+        self.conn: Any = None
+
+    async def open(self) -> None:
+        self.conn = await engines.engine().connect()
+        # A seeding run can simply be redone if the machine crashes midway
+        await self.conn.exec_driver_sql("PRAGMA synchronous = OFF")
+
+    async def write(self, table: str, rows: Sequence[tuple]) -> None:
+        columns = COLUMNS[table]
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        await self.conn.exec_driver_sql(sql, list(rows))
+        await self.conn.commit()
+
+    async def close(self) -> None:
+        if self.conn is not None:
+            await self.conn.close()
+
+
+class PostgresWriter:
+    """``COPY`` through a dedicated asyncpg connection, one transaction per batch."""
+
+    def __init__(self, url: str) -> None:
+        self.dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.conn: Any = None
+
+    async def open(self) -> None:
+        import asyncpg
+
+        self.conn = await asyncpg.connect(self.dsn)
+
+    async def write(self, table: str, rows: Sequence[tuple]) -> None:
+        async with self.conn.transaction():
+            await self.conn.copy_records_to_table(table, records=rows, columns=COLUMNS[table])
+
+    async def close(self) -> None:
+        if self.conn is not None:
+            await self.conn.close()
+
+
+async def max_ids() -> Dict[str, int]:
+    async with engines.engine().connect() as conn:
+        return {
+            table: (await conn.scalar(text(f"SELECT max(id) FROM {table}"))) or 0
+            for table in COLUMNS
+        }
+
+
+async def suspend_search_index(dialect: str) -> List[str]:
+    """Disable the per-row search triggers; returns what restoring needs."""
+    async with engines.engine().begin() as conn:
+        if dialect == "sqlite":
+            result = await conn.execute(
+                text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")
+            )
+            saved = [sql for name, sql in result if name in SQLITE_SEARCH_TRIGGERS]
+            for name in SQLITE_SEARCH_TRIGGERS:
+                await conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+            return saved
+        for table, trigger in POSTGRES_SEARCH_TRIGGERS.items():
+            await conn.exec_driver_sql(f"ALTER TABLE {table} DISABLE TRIGGER {trigger}")
+        return []
+
+
+async def rebuild_search_index(dialect: str, saved: List[str], after_note_id: int) -> None:
+    """Re-enable the search triggers and index notes with id > ``after_note_id``."""
+    async with engines.engine().begin() as conn:
+        if dialect == "sqlite":
+            await conn.execute(text(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, content, plans) "
+                "SELECT n.id, n.title, coalesce(n.content, ''), coalesce(p.titles, '') "
+                "FROM notes n LEFT JOIN ("
+                "  SELECT note_id, group_concat(title, ' ') AS titles FROM plans "
+                "  WHERE note_id > :after GROUP BY note_id"
+                ") p ON p.note_id = n.id WHERE n.id > :after"
+            ), {"after": after_note_id})
+            for sql in saved:
+                await conn.exec_driver_sql(sql)
+            return
+        for table, trigger in POSTGRES_SEARCH_TRIGGERS.items():
+            await conn.exec_driver_sql(f"ALTER TABLE {table} ENABLE TRIGGER {trigger}")
+        await conn.execute(text(
+            f"UPDATE notes SET {SEARCH_VECTOR_COLUMN} = notes_search_vector(id, title, content) "
+            "WHERE id > :after"
+        ), {"after": after_note_id})
+
+
+async def reset_sequences() -> None:
+    """Move Postgres id sequences past the explicitly assigned ids."""
+    async with engines.engine().begin() as conn:
+        for table in COLUMNS:
+            await conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT coalesce(max(id), 1) FROM {table}))"
+            ))
+
+
+async def seed(args: argparse.Namespace) -> Progress:
+    url = args.database_url or get_database_url()
+    # Every large batch would otherwise be reported as a slow query
+    settings.SLOW_QUERY_SECONDS = 0
+    engines.configure(url)
+    try:
+        await init_db()
+        dialect = engines.engine().dialect.name
+        if dialect == "postgresql":
+            writer: Any = PostgresWriter(url)
+        elif dialect == "sqlite":
+            writer = SqliteWriter()
+        else:
+            raise SystemExit(f"Unsupported database: {dialect}")
+
+        start_ids = await max_ids()
+        generator = Generator(args, start_ids, dialect)
+        notes = args.users * args.notes_per_user
+        progress = Progress(int(args.users + notes + notes * args.plans_per_note), args.quiet)
+        saved_triggers = await suspend_search_index(dialect)
+        await writer.open()
+        try:
+            for table, rows in generator.batches():
+                await writer.write(table, rows)
+                progress.add(table, len(rows))
+        finally:
+            await writer.close()
+            # Also after a failure, so the rows loaded so far are searchable
+            await rebuild_search_index(dialect, saved_triggers, start_ids["notes"])
+        if dialect == "postgresql":
+            await reset_sequences()
+        return progress
+    finally:
+        await engines.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--notes-per-user", type=float, default=20, help="mean")
+    parser.add_argument("--plans-per-note", type=float, default=3, help="mean")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--as-of",
+        type=lambda value: datetime.fromisoformat(value).replace(tzinfo=timezone.utc),
+        default=datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0),
+        help="latest timestamp to generate, ISO date (default: today)",
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--username-prefix", default="seed")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--quiet", action="store_true", help="no progress output")
+    args = parser.parse_args()
+
+    result = asyncio.run(seed(args))
+    result.report()
@@ -1,11 +1,14 @@
+import asyncio
 import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
 import pytest_asyncio
-from asgi_lifespan import LifespanManager
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 
 # Ensure "app" package is importable inside container and locally
 repo_root = Path(__file__).resolve().parents[1]
@@ -13,28 +16,111 @@ if str(repo_root) not in sys.path:
     sys.path.insert(0, str(repo_root))
 
 # Use in-memory SQLite database for tests
-os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///:memory:"
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL
 
+from app.core.hashing import password_hasher  # noqa: E402
+from app.db.base import EngineRegistry, _upgrade_schema, engines  # noqa: E402
+from app.db.instrumentation import record_queries  # noqa: E402
 from app.main import app  # noqa: E402
 
+# Issued by the async_client fixture's SAVEPOINTs, not by the code under test
+TRANSACTION_CONTROL = ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK")
 
-@pytest_asyncio.fixture(scope="function")
-async def async_client():
-    """Create a new client for each test with isolated in-memory database."""
-    async with LifespanManager(app):
-        transport = ASGITransport(app=app)
-        async with AsyncClient(
-            transport=transport, base_url="http://testserver"
-        ) as client:
-            yield client
 
+def worker_database_url(url, worker):
+    """Per-worker variant of ``url`` when running under pytest-xdist.
 
-@pytest.fixture(autouse=True)
-def reset_database_state():
-    """Reset database connections between tests."""
-    # Reset global engine and session maker to force recreation
-    from app.db import base
+    In-memory SQLite is already private to each worker process. Any other
+    database gets the worker id appended to its name, e.g. ``notehub_test_gw0``;
+    those databases must exist beforehand.
+    """
+    parsed = make_url(url)
+    if not worker or parsed.database in (None, "", ":memory:"):
+        return url
+    stem, ext = parsed.database, ""
+    if parsed.get_backend_name() == "sqlite":
+        stem, ext = os.path.splitext(parsed.database)
+    worker_url = parsed.set(database=f"{stem}_{worker}{ext}")
+    return worker_url.render_as_string(hide_password=False)
 
-    base._engine = None
-    base._session_maker = None
-    base._current_db_url = None
+
+def _use_sqlite_savepoints(engine):
+    # The sqlite3 driver opens transactions on its own and breaks SAVEPOINT;
+    # leave transaction control to SQLAlchemy instead
+    @event.listens_for(engine, "connect")
+    def disable_driver_transactions(dbapi_connection, _record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+@pytest_asyncio.fixture(scope="session")
+async def database_engine():
+    """One engine and migrated schema for the whole session (per xdist worker)."""
+    url = worker_database_url(
+        os.environ.get("TEST_DATABASE_URL", TEST_DATABASE_URL),
+        os.environ.get("PYTEST_XDIST_WORKER"),
+    )
+    registry = EngineRegistry()
+    engine = registry.configure(url)
+    if engine.url.get_backend_name() == "sqlite":
+        _use_sqlite_savepoints(engine.sync_engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(_upgrade_schema)
+    yield engine
+    await registry.dispose()
+    await asyncio.to_thread(password_hasher.shutdown)
+
+
+@pytest_asyncio.fixture
+async def async_client(database_engine):
+    """Client whose database writes are rolled back when the test ends.
+
+    Every test runs inside one transaction on the shared schema; the app's
+    sessions commit to SAVEPOINTs within it.
+    """
+    async with database_engine.connect() as conn:
+        transaction = await conn.begin()
+        engines.bind(database_engine, conn)
+        try:
+            transport = ASGITransport(app=app)
+            async with AsyncClient(
+                transport=transport, base_url="http://testserver"
+            ) as client:
+                yield client
+        finally:
+            engines.unbind()
+            await transaction.rollback()
+
+
+@pytest.fixture
+def query_budget():
+    """Assert how many SQL statements a block of requests issues.
+
+    Usage::
+
+        with query_budget(2) as queries:
+            await async_client.put(...)
+        assert queries.verbs() == ["UPDATE"]
+
+    Fails if more than ``max_queries`` statements ran, or if one statement
+    shape ran more than once (the N+1 pattern) unless ``allow_repeats``.
+    """
+    @contextmanager
+    def budget(max_queries, *, allow_repeats=False):
+        with record_queries(ignore=TRANSACTION_CONTROL) as recorder:
+            yield recorder
+        assert recorder.count <= max_queries, (
+            f"expected at most {max_queries} statements, got {recorder.count}:\n"
+            + recorder.report()
+        )
+        repeated = recorder.repeated()
+        assert allow_repeats or not repeated, (
+            "statements repeated (N+1?):\n"
+            + "\n".join(f"{n}x {shape}" for shape, n in repeated.items())
+        )
+
+    return budget
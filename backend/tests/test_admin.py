@@ -0,0 +1,197 @@
+import json
+
+import pytest
+from sqlalchemy import update
+
+from app.db import models
+from app.db.base import get_session_maker
+
+
+# Helper functions for test setup
+async def create_authenticated_user(client, username, password="secret123", admin=False):
+    """Helper function to register and login a user, returning token."""
+    r = await client.post(
+        "/auth/register", json={"username": username, "password": password}
+    )
+    assert r.status_code == 200, r.text
+    if admin:
+        async with get_session_maker()() as db:
+            await db.execute(
+                update(models.User)
+                .where(models.User.username == username)
+                .values(is_admin=True)
+            )
+            await db.commit()
+    r = await client.post(
+        "/auth/login",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return r.json()["access_token"]
+
+
+async def create_note(client, token, title="Test Note", content="Test Content"):
+    """Helper function to create a note and return the note data."""
+    r = await client.post(
+        "/notes",
+        json={"title": title, "content": content},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+@pytest.mark.asyncio
+async def test_admin_notes_full_view(async_client):
+    """Test that admins see notes of all users with content and plans."""
+    admin = await create_authenticated_user(async_client, "admin", admin=True)
+    user = await create_authenticated_user(async_client, "someone")
+    await create_note(async_client, user, "User Note", "Body")
+
+    r = await async_client.get("/admin/notes", headers={"Authorization": f"Bearer {admin}"})
+    assert r.status_code == 200
+    [note] = r.json()
+    assert note["content"] == "Body"
+    assert note["plans"] == []
+
+
+@pytest.mark.asyncio
+async def test_admin_notes_summary_view(async_client):
+    """Test that the admin summary view skips content and plans."""
+    admin = await create_authenticated_user(async_client, "admin", admin=True)
+    user1 = await create_authenticated_user(async_client, "someone")
+    user2 = await create_authenticated_user(async_client, "another")
+    await create_note(async_client, user1, "First", "a" * 500)
+    await create_note(async_client, user2, "Second", None)
+
+    r = await async_client.get(
+        "/admin/notes",
+        params={"view": "summary"},
+        headers={"Authorization": f"Bearer {admin}"},
+    )
+    assert r.status_code == 200
+    notes = r.json()
+    assert [n["title"] for n in notes] == ["Second", "First"]
+    assert notes[0]["preview"] is None
+    assert len(notes[1]["preview"]) == 160
+    assert all("content" not in n and n["plan_count"] == 0 for n in notes)
+
+
+@pytest.mark.asyncio
+async def test_admin_notes_ndjson_stream(async_client, monkeypatch):
+    """Test that all notes can be streamed as NDJSON in batches."""
+    from app.api import admin
+
+    monkeypatch.setattr(admin, "STREAM_BATCH_SIZE", 2)
+    admin_token = await create_authenticated_user(async_client, "streamadmin", admin=True)
+    user_token = await create_authenticated_user(async_client, "streamuser")
+    ids = [
+        (await create_note(async_client, token, f"Note {i}"))["id"]
+        for i, token in enumerate([user_token, admin_token, user_token, user_token, admin_token])
+    ]
+    r = await async_client.post(
+        f"/notes/{ids[0]}/plans",
+        json={"title": "Plan"},
+        headers={"Authorization": f"Bearer {user_token}"},
+    )
+    assert r.status_code == 201
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    r = await async_client.get("/admin/notes", params={"format": "ndjson"}, headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [n["id"] for n in lines] == ids
+    assert [p["title"] for p in lines[0]["plans"]] == ["Plan"]
+
+    r = await async_client.get(
+        "/admin/notes", params={"format": "ndjson", "view": "summary"}, headers=headers
+    )
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [n["id"] for n in lines] == ids
+    assert lines[0]["plan_count"] == 1 and "plans" not in lines[0]
+
+
+@pytest.mark.asyncio
+async def test_admin_notes_ndjson_requires_admin(async_client):
+    """Test that the NDJSON stream is admin only."""
+    token = await create_authenticated_user(async_client, "streamnonadmin")
+    r = await async_client.get(
+        "/admin/notes",
+        params={"format": "ndjson"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert r.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_admin_users_counts_and_pagination(async_client):
+    """Test that users are paged by id and carry note and plan counts."""
+    admin_token = await create_authenticated_user(async_client, "pageadmin", admin=True)
+    tokens = [
+        await create_authenticated_user(async_client, f"pageuser{i}") for i in range(3)
+    ]
+    note = await create_note(async_client, tokens[0])
+    await create_note(async_client, tokens[0])
+    r = await async_client.post(
+        f"/notes/{note['id']}/plans:batch",
+        json={"plans": [{"title": "a"}, {"title": "b"}]},
+        headers={"Authorization": f"Bearer {tokens[0]}"},
+    )
+    assert r.status_code == 201
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    seen = []
+    cursor = None
+    for _ in range(4):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        r = await async_client.get("/admin/users", params=params, headers=headers)
+        assert r.status_code == 200
+        seen.extend(r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert [u["username"] for u in seen] == ["pageadmin"] + [f"pageuser{i}" for i in range(3)]
+    counts = {u["username"]: (u["note_count"], u["plan_count"]) for u in seen}
+    assert counts["pageuser0"] == (2, 2)
+    assert counts["pageuser1"] == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_admin_users_prefix_search(async_client):
+    """Test username prefix search, with LIKE wildcards matched literally."""
+    admin_token = await create_authenticated_user(async_client, "searchadmin", admin=True)
+    for username in ("alice", "alina", "bob", "al_x", "alzx"):
+        await create_authenticated_user(async_client, username)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    r = await async_client.get("/admin/users", params={"q": "ali"}, headers=headers)
+    assert [u["username"] for u in r.json()] == ["alice", "alina"]
+    r = await async_client.get("/admin/users", params={"q": "al_"}, headers=headers)
+    assert [u["username"] for u in r.json()] == ["al_x"]
+
+
+@pytest.mark.asyncio
+async def test_admin_user_notes_pagination(async_client):
+    """Test that a user's notes can be paged by the admin."""
+    admin_token = await create_authenticated_user(async_client, "notesadmin", admin=True)
+    user_token = await create_authenticated_user(async_client, "notesowner")
+    ids = [(await create_note(async_client, user_token, f"N{i}"))["id"] for i in range(3)]
+    r = await async_client.get("/users/me", headers={"Authorization": f"Bearer {user_token}"})
+    user_id = r.json()["id"]
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    r = await async_client.get(
+        f"/admin/users/{user_id}/notes", params={"limit": 2}, headers=headers
+    )
+    first = [n["id"] for n in r.json()]
+    cursor = r.headers["X-Next-Cursor"]
+    r = await async_client.get(
+        f"/admin/users/{user_id}/notes",
+        params={"limit": 2, "cursor": cursor},
+        headers=headers,
+    )
+    second = [n["id"] for n in r.json()]
+    assert "X-Next-Cursor" not in r.headers
+    assert sorted(first + second) == sorted(ids)
@@ -189,3 +189,93 @@ async def test_notes_isolation_between_users(async_client):
     notes2 = r2.json()
     assert len(notes2) == 1
     assert notes2[0]["title"] == "User2 Note"
+
+
+# Token claims tests
+@pytest.mark.asyncio
+async def test_token_carries_identity_claims(async_client):
+    """Test that issued tokens embed the user id and admin flag."""
+    from app.core.security import decode_token
+
+    user = await register_user(async_client, "claimsuser", "password123")
+    token = await login_user(async_client, "claimsuser", "password123")
+
+    payload = decode_token(token, secret_key="secret")
+    assert payload["sub"] == "claimsuser"
+    assert payload["uid"] == user["id"]
+    assert payload["adm"] is False
+
+
+@pytest.mark.asyncio
+async def test_legacy_token_without_identity_claims(async_client):
+    """Test that tokens carrying only the username are still accepted."""
+    from app.core.security import create_access_token
+
+    await register_user(async_client, "legacyuser", "password123")
+    token = create_access_token(subject="legacyuser", secret_key="secret")
+
+    r = await async_client.post(
+        "/notes",
+        json={"title": "Legacy Note", "content": ""},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert r.status_code == 201
+
+    r = await async_client.get("/notes", headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 200
+    assert [n["title"] for n in r.json()] == ["Legacy Note"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_token_for_unknown_user(async_client):
+    """Test that a username-only token for a missing user is rejected."""
+    from app.core.security import create_access_token
+
+    token = create_access_token(subject="ghost", secret_key="secret")
+    r = await async_client.get("/notes", headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoints_require_admin_claim(async_client):
+    """Test that non-admin tokens are rejected by admin endpoints."""
+    token = await create_authenticated_user(async_client, "plainuser", "password123")
+
+    r = await async_client.get(
+        "/admin/users", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert r.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_admin_revocation_takes_effect_immediately(async_client):
+    """Test that demoting an admin blocks admin routes despite the adm claim."""
+    from sqlalchemy import update
+
+    from app.db import models
+    from app.db.base import get_session_maker
+
+    await register_user(async_client, "demoted", "password123")
+    async with get_session_maker()() as db:
+        await db.execute(
+            update(models.User)
+            .where(models.User.username == "demoted")
+            .values(is_admin=True)
+        )
+        await db.commit()
+    token = await login_user(async_client, "demoted", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    r = await async_client.get("/admin/users", headers=headers)
+    assert r.status_code == 200
+
+    async with get_session_maker()() as db:
+        await db.execute(
+            update(models.User)
+            .where(models.User.username == "demoted")
+            .values(is_admin=False)
+        )
+        await db.commit()
+
+    r = await async_client.get("/admin/users", headers=headers)
+    assert r.status_code == 403
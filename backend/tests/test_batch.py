@@ -0,0 +1,143 @@
+import pytest
+
+
+# Helper functions for test setup
+async def create_authenticated_user(client, username="batchuser", password="secret123"):
+    """Helper function to register and login a user, returning auth headers."""
+    await client.post(
+        "/auth/register", json={"username": username, "password": password}
+    )
+    r = await client.post(
+        "/auth/login",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def create_note(client, headers, title="Test Note", content="Test Content"):
+    """Helper function to create a note and return the note data."""
+    r = await client.post("/notes", json={"title": title, "content": content}, headers=headers)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+@pytest.mark.asyncio
+async def test_create_plans_batch(async_client):
+    """Test creating several plans under a note in one request."""
+    headers = await create_authenticated_user(async_client)
+    note = await create_note(async_client, headers)
+
+    r = await async_client.post(
+        f"/notes/{note['id']}/plans:batch",
+        json={"plans": [{"title": f"Plan {i}", "is_done": i == 0} for i in range(30)]},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    plans = r.json()
+    assert [p["title"] for p in plans] == [f"Plan {i}" for i in range(30)]
+    assert plans[0]["is_done"] and not plans[1]["is_done"]
+    assert all(p["note_id"] == note["id"] and p["created_at"] for p in plans)
+
+    r = await async_client.get(f"/notes/{note['id']}/plans", headers=headers)
+    assert len(r.json()) == 30
+
+
+@pytest.mark.asyncio
+async def test_create_plans_batch_other_users_note(async_client):
+    """Test that plans cannot be batch-created under another user's note."""
+    owner = await create_authenticated_user(async_client, "batchowner")
+    intruder = await create_authenticated_user(async_client, "batchintruder")
+    note = await create_note(async_client, owner)
+
+    r = await async_client.post(
+        f"/notes/{note['id']}/plans:batch",
+        json={"plans": [{"title": "Nope"}]},
+        headers=intruder,
+    )
+    assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_batch_mixed_operations(async_client):
+    """Test that mixed operations are applied and reported in request order."""
+    headers = await create_authenticated_user(async_client)
+    note = await create_note(async_client, headers, "Old title")
+    doomed = await create_note(async_client, headers, "Doomed")
+    r = await async_client.post(
+        f"/notes/{note['id']}/plans:batch",
+        json={"plans": [{"title": "Keep"}, {"title": "Drop"}]},
+        headers=headers,
+    )
+    keep, drop = r.json()
+
+    r = await async_client.post(
+        "/batch",
+        json={"operations": [
+            {"op": "create", "entity": "note", "title": "New", "content": "Body"},
+            {"op": "update", "entity": "note", "id": note["id"], "title": "New title"},
+            {"op": "create", "entity": "plan", "note_id": note["id"], "title": "Added"},
+            {"op": "update", "entity": "plan", "id": keep["id"], "is_done": True},
+            {"op": "delete", "entity": "plan", "id": drop["id"]},
+            {"op": "delete", "entity": "note", "id": doomed["id"]},
+        ]},
+        headers=headers,
+    )
+    assert r.status_code == 200, r.text
+    results = r.json()["results"]
+    assert [res["status"] for res in results] == [201, 200, 201, 200, 204, 204]
+    assert results[0]["note"]["title"] == "New"
+    assert results[1]["note"]["title"] == "New title"
+    assert results[2]["plan"]["note_id"] == note["id"]
+    assert results[3]["plan"]["is_done"] is True
+
+    r = await async_client.get(f"/notes/{note['id']}", headers=headers)
+    body = r.json()
+    assert body["title"] == "New title"
+    assert {p["title"]: p["is_done"] for p in body["plans"]} == {"Keep": True, "Added": False}
+    r = await async_client.get(f"/notes/{doomed['id']}", headers=headers)
+    assert r.status_code == 404
+
+    r = await async_client.get("/sync", params={"since": "MjAwMC0wMS0wMVQwMDowMDowMA"}, headers=headers)
+    deleted = {(d["entity"], d["id"]) for d in r.json()["deleted"]}
+    assert deleted == {("plan", drop["id"]), ("note", doomed["id"])}
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_unowned_items(async_client):
+    """Test that operations on other users' rows fail individually with 404."""
+    owner = await create_authenticated_user(async_client, "batchowner2")
+    intruder = await create_authenticated_user(async_client, "batchintruder2")
+    note = await create_note(async_client, owner, "Private")
+
+    r = await async_client.post(
+        "/batch",
+        json={"operations": [
+            {"op": "update", "entity": "note", "id": note["id"], "title": "Hacked"},
+            {"op": "create", "entity": "plan", "note_id": note["id"], "title": "Hacked"},
+            {"op": "delete", "entity": "plan", "id": 999999},
+            {"op": "create", "entity": "note", "title": "Mine"},
+        ]},
+        headers=intruder,
+    )
+    assert r.status_code == 200, r.text
+    results = r.json()["results"]
+    assert [res["status"] for res in results] == [404, 404, 404, 201]
+    assert results[2]["detail"] == "Plan not found"
+
+    r = await async_client.get(f"/notes/{note['id']}", headers=owner)
+    assert r.json()["title"] == "Private"
+    assert r.json()["plans"] == []
+
+
+@pytest.mark.asyncio
+async def test_batch_validates_operations(async_client):
+    """Test that malformed operations reject the whole batch."""
+    headers = await create_authenticated_user(async_client)
+    r = await async_client.post(
+        "/batch",
+        json={"operations": [{"op": "update", "entity": "note", "title": "No id"}]},
+        headers=headers,
+    )
+    assert r.status_code == 422
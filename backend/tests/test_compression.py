@@ -0,0 +1,108 @@
+import gzip
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+
+# Helper functions for test setup
+async def create_authenticated_user(client, username="gzipuser", password="secret123"):
+    """Helper function to register and login a user, returning auth headers."""
+    await client.post(
+        "/auth/register", json={"username": username, "password": password}
+    )
+    r = await client.post(
+        "/auth/login",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def stream_rows(request):
+    async def rows():
+        for i in range(3):
+            yield f'{{"row": {i}}}\n'.encode() * 100
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+def standalone_client():
+    app = Starlette(routes=[
+        Route("/stream", stream_rows),
+        Route("/small", lambda request: PlainTextResponse("ok")),
+    ])
+    wrapped = CompressionMiddleware(app, minimum_size=100)
+    return AsyncClient(transport=ASGITransport(app=wrapped), base_url="http://testserver")
+
+
+def test_choose_encoding_honours_q_values():
+    """Test Accept-Encoding negotiation with q-values, wildcards and exclusions."""
+    servers = ["zstd", "br", "gzip"]
+    assert choose_encoding("gzip, deflate", servers) == "gzip"
+    assert choose_encoding("gzip;q=0.5, br;q=0.9", servers) == "br"
+    assert choose_encoding("gzip, br, zstd", servers) == "zstd"
+    assert choose_encoding("*;q=0.1, zstd;q=0", servers) == "br"
+    assert choose_encoding("gzip;q=0", servers) is None
+    assert choose_encoding("identity", servers) is None
+    assert choose_encoding("GZIP; Q=1.0", ["gzip"]) == "gzip"
+
+
+@pytest.mark.asyncio
+async def test_large_responses_are_compressed(async_client):
+    """Test that a large listing is gzipped and small responses are not."""
+    headers = await create_authenticated_user(async_client)
+    for i in range(5):
+        await async_client.post(
+            "/notes", json={"title": f"Note {i}", "content": "lorem ipsum " * 50}, headers=headers
+        )
+
+    r = await async_client.get("/notes", headers={**headers, "Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["Vary"]
+    assert int(r.headers["Content-Length"]) < len(r.content)
+    assert len(r.json()) == 5
+
+    r = await async_client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in r.headers
+
+    r = await async_client.get("/notes", headers={**headers, "Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in r.headers
+    assert len(r.json()) == 5
+
+
+@pytest.mark.asyncio
+async def test_not_modified_is_left_alone(async_client):
+    """Test that 304 responses pass through without a Content-Encoding."""
+    headers = await create_authenticated_user(async_client)
+    await async_client.post("/notes", json={"title": "x", "content": "y" * 1000}, headers=headers)
+    etag = (await async_client.get("/notes", headers=headers)).headers["ETag"]
+
+    r = await async_client.get(
+        "/notes", headers={**headers, "If-None-Match": etag, "Accept-Encoding": "gzip"}
+    )
+    assert r.status_code == 304
+    assert "Content-Encoding" not in r.headers
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_compressed_per_chunk():
+    """Test that streamed bodies are compressed without a Content-Length."""
+    async with standalone_client() as client:
+        async with client.stream(
+            "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+        ) as r:
+            assert r.headers["Content-Encoding"] == "gzip"
+            assert "Content-Length" not in r.headers
+            raw = b"".join([chunk async for chunk in r.aiter_raw()])
+        assert gzip.decompress(raw).count(b'"row"') == 300
+
+        r = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert r.text == "ok"
+        assert "Content-Encoding" not in r.headers
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.db.base import engine_options
+from app.db.pool import (
+    InstrumentedPool,
+    pool_checked_out,
+    pool_checkout_seconds,
+    pool_checkout_timeouts,
+)
+
+
+def test_engine_options_from_settings():
+    """Test that pool settings apply to server databases and are skipped for SQLite."""
+    options = engine_options("postgresql+asyncpg://user:pw@db/notehub")
+    assert options["poolclass"] is InstrumentedPool
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+    assert options["pool_pre_ping"] is settings.DB_POOL_PRE_PING
+    assert "prepared_statement_cache_size" in options["connect_args"]
+
+    assert engine_options("sqlite+aiosqlite:///:memory:") == {"echo": settings.DB_ECHO}
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_metrics(tmp_path):
+    """Test that checkouts, connections in use and timeouts are recorded."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedPool,
+        pool_logging_name="pooltest",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert pool_checked_out.value(pool="pooltest") == 1
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+        assert pool_checked_out.value(pool="pooltest") == 0
+        assert pool_checkout_timeouts.value(pool="pooltest") == 1
+        assert pool_checkout_seconds.count(pool="pooltest") == 2
+    finally:
+        await engine.dispose()
@@ -0,0 +1,60 @@
+import pytest
+from asgi_lifespan import LifespanManager
+from sqlalchemy import func, select
+
+from app.db import models
+from app.db.base import EngineRegistry, engines, get_engine
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_lifespan_builds_and_disposes_engine():
+    """Test that the app builds its engine on startup and drops it on shutdown."""
+    assert not engines.is_configured()
+    async with LifespanManager(app):
+        assert engines.is_configured()
+        assert get_engine().url.get_backend_name() == "sqlite"
+    assert not engines.is_configured()
+    with pytest.raises(RuntimeError):
+        get_engine()
+
+
+@pytest.mark.asyncio
+async def test_registry_engines_are_independent(tmp_path):
+    """Test that named engines can be configured side by side and swapped."""
+    registry = EngineRegistry()
+    first = registry.configure(f"sqlite+aiosqlite:///{tmp_path / 'a.db'}")
+    replica = registry.configure(f"sqlite+aiosqlite:///{tmp_path / 'b.db'}", name="replica")
+    assert registry.engine() is first
+    assert registry.engine("replica") is replica
+
+    await registry.dispose()
+    swapped = registry.configure(f"sqlite+aiosqlite:///{tmp_path / 'c.db'}")
+    assert registry.engine() is swapped is not first
+    assert not registry.is_configured("replica")
+    await registry.dispose()
+
+
+@pytest.mark.asyncio
+async def test_bound_registry_commits_to_savepoints(database_engine):
+    """Test that commits through a bound connection are undone by its rollback."""
+    async def count_users(db):
+        return await db.scalar(select(func.count()).select_from(models.User))
+
+    registry = EngineRegistry()
+    async with database_engine.connect() as conn:
+        transaction = await conn.begin()
+        registry.bind(database_engine, conn)
+        async with registry.session_maker()() as db:
+            before = await count_users(db)
+            db.add(models.User(username="savepointuser", password_hash="x"))
+            await db.commit()
+        async with registry.session_maker()() as db:
+            assert await count_users(db) == before + 1
+        registry.unbind()
+        await transaction.rollback()
+    assert not registry.is_configured()
+
+    async with database_engine.connect() as conn:
+        count = await conn.scalar(select(func.count()).select_from(models.User))
+    assert count == before
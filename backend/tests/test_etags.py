@@ -0,0 +1,95 @@
+import pytest
+
+
+# Helper functions for test setup
+async def create_authenticated_user(client, username="etaguser", password="secret123"):
+    """Helper function to register and login a user, returning auth headers."""
+    await client.post(
+        "/auth/register", json={"username": username, "password": password}
+    )
+    r = await client.post(
+        "/auth/login",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def create_note(client, headers, title="Test Note", content="Test Content"):
+    """Helper function to create a note and return the note data."""
+    r = await client.post("/notes", json={"title": title, "content": content}, headers=headers)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+async def revalidate(client, url, headers, etag, **params):
+    return await client.get(url, params=params, headers={**headers, "If-None-Match": etag})
+
+
+@pytest.mark.asyncio
+async def test_notes_list_etag(async_client):
+    """Test that the notes listing answers 304 until a note changes."""
+    headers = await create_authenticated_user(async_client)
+    await create_note(async_client, headers, "First")
+
+    r = await async_client.get("/notes", headers=headers)
+    etag = r.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    r = await revalidate(async_client, "/notes", headers, etag)
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["ETag"] == etag
+
+    r = await revalidate(async_client, "/notes", headers, etag, view="summary")
+    assert r.status_code == 200
+
+    await create_note(async_client, headers, "Second")
+    r = await revalidate(async_client, "/notes", headers, etag)
+    assert r.status_code == 200
+    assert len(r.json()) == 2
+    assert r.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_note_and_plans_etag_follow_plan_changes(async_client):
+    """Test that a note and its plan listing revalidate until a plan changes."""
+    headers = await create_authenticated_user(async_client)
+    note = await create_note(async_client, headers)
+    note_url = f"/notes/{note['id']}"
+    plans_url = f"{note_url}/plans"
+
+    note_etag = (await async_client.get(note_url, headers=headers)).headers["ETag"]
+    plans_etag = (await async_client.get(plans_url, headers=headers)).headers["ETag"]
+    assert note_etag != plans_etag
+    assert (await revalidate(async_client, note_url, headers, note_etag)).status_code == 304
+    assert (await revalidate(async_client, plans_url, headers, plans_etag)).status_code == 304
+
+    r = await async_client.post(plans_url, json={"title": "New plan"}, headers=headers)
+    plan_id = r.json()["id"]
+    r = await revalidate(async_client, note_url, headers, note_etag)
+    assert r.status_code == 200
+    assert len(r.json()["plans"]) == 1
+    r = await revalidate(async_client, plans_url, headers, plans_etag)
+    assert r.status_code == 200
+    plans_etag = r.headers["ETag"]
+
+    await async_client.delete(f"{plans_url}/{plan_id}", headers=headers)
+    r = await revalidate(async_client, plans_url, headers, plans_etag)
+    assert r.status_code == 200
+    assert r.json() == []
+
+
+@pytest.mark.asyncio
+async def test_etag_does_not_leak_other_users_notes(async_client):
+    """Test that conditional requests for another user's note still 404."""
+    owner = await create_authenticated_user(async_client, "etagowner")
+    other = await create_authenticated_user(async_client, "etagother")
+    note = await create_note(async_client, owner)
+    etag = (await async_client.get(f"/notes/{note['id']}", headers=owner)).headers["ETag"]
+
+    r = await revalidate(async_client, f"/notes/{note['id']}", other, etag)
+    assert r.status_code == 404
+    r = await revalidate(async_client, f"/notes/{note['id']}/plans", other, "*")
+    assert r.status_code == 404
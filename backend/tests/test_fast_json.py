@@ -0,0 +1,75 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.api.fast_json import ORJSONResponse
+from app.core.config import settings
+
+
+# Helper functions for test setup
+async def create_authenticated_user(client, username="fastjsonuser", password="secret123"):
+    """Helper function to register and login a user, returning auth headers."""
+    await client.post(
+        "/auth/register", json={"username": username, "password": password}
+    )
+    r = await client.post(
+        "/auth/login",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def get_both_ways(client, monkeypatch, url, headers, **params):
+    """GET a URL through the validated path and the fast path."""
+    monkeypatch.setattr(settings, "FAST_JSON", False)
+    slow = await client.get(url, params=params, headers=headers)
+    monkeypatch.setattr(settings, "FAST_JSON", True)
+    fast = await client.get(url, params=params, headers=headers)
+    assert slow.status_code == fast.status_code == 200
+    return slow, fast
+
+
+@pytest.mark.asyncio
+async def test_fast_path_matches_response_models(async_client, monkeypatch):
+    """Test that direct serialization produces the same JSON as response_model."""
+    headers = await create_authenticated_user(async_client)
+    r = await async_client.post(
+        "/notes", json={"title": "Fast", "content": "Ünïcode"}, headers=headers
+    )
+    note = r.json()
+    await async_client.post("/notes", json={"title": "No content"}, headers=headers)
+    await async_client.post(
+        f"/notes/{note['id']}/plans", json={"title": "Plan", "is_done": True}, headers=headers
+    )
+
+    for url in ("/notes", f"/notes/{note['id']}", f"/notes/{note['id']}/plans", "/users/me"):
+        slow, fast = await get_both_ways(async_client, monkeypatch, url, headers)
+        assert fast.json() == slow.json(), url
+        assert fast.content == slow.content, url
+
+
+@pytest.mark.asyncio
+async def test_fast_path_keeps_headers(async_client, monkeypatch):
+    """Test that ETag and cursor headers survive the fast path."""
+    headers = await create_authenticated_user(async_client)
+    for i in range(3):
+        await async_client.post("/notes", json={"title": f"Note {i}"}, headers=headers)
+
+    slow, fast = await get_both_ways(async_client, monkeypatch, "/notes", headers, limit=2)
+    assert fast.headers["ETag"] == slow.headers["ETag"]
+    assert fast.headers["X-Next-Cursor"] == slow.headers["X-Next-Cursor"]
+    assert len(fast.json()) == 2
+
+    r = await async_client.get(
+        "/notes", params={"limit": 2}, headers={**headers, "If-None-Match": fast.headers["ETag"]}
+    )
+    assert r.status_code == 304
+
+
+def test_orjson_response_renders_utc_like_pydantic():
+    """Test that aware UTC datetimes are written with a Z suffix."""
+    body = ORJSONResponse({"at": datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc)}).body
+    assert json.loads(body) == {"at": "2024-01-02T03:04:05.000006Z"}
@@ -0,0 +1,27 @@
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+
+from app.db import models  # noqa: F401
+from app.db.base import Base, get_session_maker
+from app.db.search import is_search_object
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and is_search_object(name, type_))
+
+
+@pytest.mark.asyncio
+async def test_migrations_match_models(async_client):
+    """Test that migrating to head yields exactly the schema the models declare."""
+    async with get_session_maker()() as db:
+        conn = await db.connection()
+        diff = await conn.run_sync(
+            lambda sync_conn: compare_metadata(
+                MigrationContext.configure(
+                    sync_conn, opts={"include_object": include_object}
+                ),
+                Base.metadata,
+            )
+        )
+    assert diff == []
@@ -297,3 +297,147 @@ async def test_get_single_note_without_auth(async_client):
     """Test getting a note without authentication."""
     r = await async_client.get("/notes/1")
     assert r.status_code == 401
+
+
+# Note listing pagination tests
+@pytest.mark.asyncio
+async def test_list_notes_newest_first(async_client):
+    """Test that notes are listed most recently updated first."""
+    token = await create_authenticated_user(async_client, "orderuser")
+    ids = [(await create_note(async_client, token, f"Note {i}"))["id"] for i in range(3)]
+
+    r = await async_client.get("/notes", headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 200
+    assert [n["id"] for n in r.json()] == list(reversed(ids))
+    assert "X-Next-Cursor" not in r.headers
+
+
+@pytest.mark.asyncio
+async def test_list_notes_cursor_pagination(async_client):
+    """Test paging through notes with limit and cursor."""
+    token = await create_authenticated_user(async_client, "pageuser")
+    ids = [(await create_note(async_client, token, f"Note {i}"))["id"] for i in range(5)]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    pages = []
+    params = {"limit": 2}
+    for _ in range(5):  # bounded so a broken cursor fails instead of hanging
+        r = await async_client.get("/notes", params=params, headers=headers)
+        assert r.status_code == 200
+        page = [n["id"] for n in r.json()]
+        assert len(page) <= 2
+        pages.append(page)
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 2, "cursor": cursor}
+
+    seen = [note_id for page in pages for note_id in page]
+    assert len(pages) == 3
+    assert len(set(seen)) == len(seen)
+    assert seen == list(reversed(ids))
+
+
+@pytest.mark.asyncio
+async def test_list_notes_invalid_cursor(async_client):
+    """Test that a malformed cursor is rejected."""
+    token = await create_authenticated_user(async_client, "badcursor")
+    r = await async_client.get(
+        "/notes",
+        params={"limit": 2, "cursor": "not-a-cursor"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert r.status_code == 400
+
+
+# Summary view tests
+@pytest.mark.asyncio
+async def test_list_notes_summary_view(async_client):
+    """Test that the summary view returns previews and plan counts only."""
+    token = await create_authenticated_user(async_client, "summaryuser")
+    headers = {"Authorization": f"Bearer {token}"}
+    note = await create_note(async_client, token, "Long Note", "x" * 1000)
+    for title, is_done in (("a", True), ("b", False), ("c", True)):
+        r = await async_client.post(
+            f"/notes/{note['id']}/plans",
+            json={"title": title, "is_done": is_done},
+            headers=headers,
+        )
+        assert r.status_code == 201
+
+    r = await async_client.get("/notes", params={"view": "summary"}, headers=headers)
+    assert r.status_code == 200
+    [summary] = r.json()
+    assert summary["id"] == note["id"]
+    assert summary["title"] == "Long Note"
+    assert summary["preview"] == "x" * 160
+    assert summary["plan_count"] == 3
+    assert summary["done_count"] == 2
+    assert "content" not in summary
+    assert "plans" not in summary
+
+
+@pytest.mark.asyncio
+async def test_list_notes_summary_view_paginates(async_client):
+    """Test that the summary view supports the same cursor pagination."""
+    token = await create_authenticated_user(async_client, "summarypages")
+    headers = {"Authorization": f"Bearer {token}"}
+    ids = [(await create_note(async_client, token, f"Note {i}"))["id"] for i in range(3)]
+
+    r = await async_client.get(
+        "/notes", params={"view": "summary", "limit": 2}, headers=headers
+    )
+    first = [n["id"] for n in r.json()]
+    r = await async_client.get(
+        "/notes",
+        params={"view": "summary", "limit": 2, "cursor": r.headers["X-Next-Cursor"]},
+        headers=headers,
+    )
+    second = [n["id"] for n in r.json()]
+    assert first + second == list(reversed(ids))
+    assert "X-Next-Cursor" not in r.headers
+
+
+@pytest.mark.asyncio
+async def test_list_notes_full_view_unchanged(async_client):
+    """Test that the default view still returns content and plans."""
+    token = await create_authenticated_user(async_client, "fullviewuser")
+    await create_note(async_client, token, "Full", "Body")
+
+    r = await async_client.get("/notes", headers={"Authorization": f"Bearer {token}"})
+    [note] = r.json()
+    assert note["content"] == "Body"
+    assert note["plans"] == []
+
+
+@pytest.mark.asyncio
+async def test_writes_return_rows_without_rereading(async_client, query_budget):
+    """Test that creates and updates read server defaults back with RETURNING."""
+    token = await create_authenticated_user(async_client, "returninguser")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with query_budget(1) as queries:
+        note = await create_note(async_client, token, "Fresh", "Body")
+    assert queries.verbs() == ["INSERT"]
+    assert note["plans"] == [] and note["created_at"] and note["updated_at"]
+
+    with query_budget(3) as queries:
+        r = await async_client.put(
+            f"/notes/{note['id']}", json={"title": "Renamed"}, headers=headers
+        )
+    assert r.status_code == 200
+    statements = queries.verbs()
+    assert statements[-1] == "UPDATE"
+    assert "SELECT" not in statements[statements.index("UPDATE"):]
+
+    with query_budget(2) as queries:
+        r = await async_client.post(
+            f"/notes/{note['id']}/plans", json={"title": "Plan"}, headers=headers
+        )
+    assert r.status_code == 201
+    assert queries.verbs()[-1] == "INSERT"
+
+    r = await async_client.get(f"/notes/{note['id']}", headers=headers)
+    fetched = r.json()
+    assert fetched["title"] == "Renamed"
+    assert [p["title"] for p in fetched["plans"]] == ["Plan"]
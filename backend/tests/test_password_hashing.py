@@ -0,0 +1,63 @@
+import pytest
+
+from app.core.hashing import PasswordHasher, hash_queue_depth, password_hasher
+
+
+@pytest.mark.asyncio
+async def test_hasher_roundtrip():
+    """Test hashing and verifying through the worker pool."""
+    hasher = PasswordHasher(max_workers=2, queue_limit=1)
+    try:
+        hashed = await hasher.hash("password123")
+        assert await hasher.verify("password123", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert hasher.pending == 0
+        assert hash_queue_depth.value() == 0
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_register_returns_503_when_queue_full(async_client, monkeypatch):
+    """Test that registration is rejected while the hashing queue is full."""
+    full = password_hasher.max_workers + password_hasher.queue_limit
+    monkeypatch.setattr(password_hasher, "_pending", full)
+
+    r = await async_client.post(
+        "/auth/register", json={"username": "busyuser", "password": "password123"}
+    )
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_login_returns_503_when_queue_full(async_client, monkeypatch):
+    """Test that login is rejected while the hashing queue is full."""
+    r = await async_client.post(
+        "/auth/register", json={"username": "busylogin", "password": "password123"}
+    )
+    assert r.status_code == 200
+
+    full = password_hasher.max_workers + password_hasher.queue_limit
+    monkeypatch.setattr(password_hasher, "_pending", full)
+    r = await async_client.post(
+        "/auth/login",
+        data={"username": "busylogin", "password": "password123"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_hash_metrics_exposed(async_client):
+    """Test that hashing metrics can be scraped from /metrics."""
+    r = await async_client.post(
+        "/auth/register", json={"username": "metricsuser", "password": "password123"}
+    )
+    assert r.status_code == 200
+
+    r = await async_client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert 'notehub_password_hash_seconds_count{operation="hash"}' in r.text
+    assert "notehub_password_hash_queue_depth" in r.text
@@ -346,3 +346,53 @@ async def test_plans_chronological_order(async_client):
     assert plans_after_update[1]["title"] == "Second plan (updated)"
     assert plans_after_update[2]["title"] == "Third plan"
     assert plans_after_update[3]["title"] == "Fourth plan"
+
+
+@pytest.mark.asyncio
+async def test_plan_mutations_are_single_statements(async_client, query_budget):
+    """Test that plan update and delete each run one ownership-scoped statement."""
+    token, note_id = await create_user_with_note(async_client, "onestatementuser")
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await async_client.post(
+        f"/notes/{note_id}/plans", json={"title": "Toggle me"}, headers=headers
+    )
+    plan_id = r.json()["id"]
+
+    with query_budget(1) as queries:
+        r = await async_client.put(
+            f"/notes/{note_id}/plans/{plan_id}", json={"is_done": True}, headers=headers
+        )
+    assert r.status_code == 200
+    assert r.json()["is_done"] is True
+    assert queries.verbs() == ["UPDATE"]
+
+    with query_budget(2) as queries:
+        r = await async_client.delete(f"/notes/{note_id}/plans/{plan_id}", headers=headers)
+    assert r.status_code == 204
+    assert queries.verbs() == ["DELETE", "INSERT"]  # the plan, then its tombstone
+
+
+@pytest.mark.asyncio
+async def test_plan_mutations_other_users_note(async_client):
+    """Test that another user's plan cannot be updated or deleted."""
+    token, note_id = await create_user_with_note(async_client, "planowner")
+    r = await async_client.post(
+        f"/notes/{note_id}/plans",
+        json={"title": "Mine"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    plan_id = r.json()["id"]
+    intruder_token = await create_authenticated_user(async_client, "planintruder")
+    intruder = {"Authorization": f"Bearer {intruder_token}"}
+
+    r = await async_client.put(
+        f"/notes/{note_id}/plans/{plan_id}", json={"title": "Stolen"}, headers=intruder
+    )
+    assert r.status_code == 404
+    r = await async_client.delete(f"/notes/{note_id}/plans/{plan_id}", headers=intruder)
+    assert r.status_code == 404
+
+    r = await async_client.get(
+        f"/notes/{note_id}/plans", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert [p["title"] for p in r.json()] == ["Mine"]
@@ -0,0 +1,101 @@
+import pytest
+
+from app.db.instrumentation import QueryRecorder, normalize_statement
+
+# Statements each endpoint may issue. Lower a budget when an endpoint gets
+# cheaper; raising one needs a reason in the commit that does it.
+BUDGETS = {
+    ("GET", "/notes", ()): 3,  # version, notes, selectin plans
+    ("GET", "/notes", (("view", "summary"),)): 2,
+    ("GET", "/notes/{note_id}", ()): 3,
+    ("GET", "/notes/{note_id}/plans", ()): 2,
+    ("GET", "/notes/search", (("q", "note"),)): 1,
+    ("GET", "/sync", ()): 3,
+    ("GET", "/users/me", ()): 1,
+    ("POST", "/notes/{note_id}/plans", ()): 2,
+    ("PUT", "/notes/{note_id}/plans/{plan_id}", ()): 1,
+    ("DELETE", "/notes/{note_id}/plans/{plan_id}", ()): 2,
+}
+
+BODIES = {
+    "POST": {"title": "Budget plan"},
+    "PUT": {"is_done": True},
+}
+
+
+# Helper functions for test setup
+async def create_authenticated_user(client, username="budgetuser", password="secret123"):
+    """Helper function to register and login a user, returning auth headers."""
+    await client.post(
+        "/auth/register", json={"username": username, "password": password}
+    )
+    r = await client.post(
+        "/auth/login",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def create_notes(client, headers, count, plans_per_note=2):
+    """Helper function to create notes with plans, returning the note ids."""
+    note_ids = []
+    for i in range(count):
+        r = await client.post("/notes", json={"title": f"Note {i}"}, headers=headers)
+        note_ids.append(r.json()["id"])
+        for j in range(plans_per_note):
+            await client.post(
+                f"/notes/{note_ids[-1]}/plans", json={"title": f"Plan {j}"}, headers=headers
+            )
+    return note_ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method,route,params", list(BUDGETS), ids=lambda v: str(v))
+async def test_endpoint_query_budget(async_client, query_budget, method, route, params):
+    """Test that each endpoint stays within its statement budget."""
+    headers = await create_authenticated_user(async_client)
+    note_ids = await create_notes(async_client, headers, 3)
+    r = await async_client.get(f"/notes/{note_ids[0]}/plans", headers=headers)
+    url = route.format(note_id=note_ids[0], plan_id=r.json()[0]["id"])
+
+    with query_budget(BUDGETS[(method, route, params)]):
+        r = await async_client.request(
+            method, url, params=dict(params), json=BODIES.get(method), headers=headers
+        )
+    assert r.status_code < 300, r.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [{}, {"view": "summary"}, {"limit": 50}])
+async def test_note_listing_is_not_n_plus_one(async_client, query_budget, params):
+    """Test that listing notes issues as many statements for 10 notes as for 1."""
+    headers = await create_authenticated_user(async_client)
+    await create_notes(async_client, headers, 1)
+    with query_budget(3) as one:
+        await async_client.get("/notes", params=params, headers=headers)
+
+    await create_notes(async_client, headers, 9)
+    with query_budget(one.count) as many:
+        r = await async_client.get("/notes", params=params, headers=headers)
+    assert len(r.json()) == 10
+    assert many.count == one.count
+
+
+def test_recorder_flags_repeated_statement_shapes():
+    """Test that the N+1 detector groups statements that differ only in IN lists."""
+    recorder = QueryRecorder()
+    recorder.statements += [
+        "SELECT * FROM plans WHERE note_id = ?",
+        "SELECT *\n  FROM plans WHERE note_id = ?",
+        "SELECT * FROM notes WHERE id IN (?, ?)",
+        "SELECT * FROM notes WHERE id IN (?, ?, ?)",
+        "UPDATE notes SET title = ? WHERE id = ?",
+    ]
+    assert recorder.repeated() == {
+        "SELECT * FROM plans WHERE note_id = ?": 2,
+        "SELECT * FROM notes WHERE id IN (...)": 2,
+    }
+    assert recorder.verbs()[-1] == "UPDATE"
+    assert normalize_statement("SELECT 1 WHERE x IN ($1, $2)") == "SELECT 1 WHERE x IN (...)"
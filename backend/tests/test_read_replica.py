@@ -0,0 +1,88 @@
+import pytest
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from app.db.base import _upgrade_schema, engines
+from app.db.routing import REPLICA, ReadAfterWrite, read_after_write, read_sessions
+from app.main import app
+
+
+@pytest_asyncio.fixture
+async def replica_client(tmp_path):
+    """Client whose reads can go to a separate SQLite file acting as the replica.
+
+    Nothing replicates between the files, so a read served by the replica does
+    not see rows written through the primary.
+    """
+    engines.configure(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = engines.configure(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}", name=REPLICA)
+    async with replica.begin() as conn:
+        await conn.run_sync(_upgrade_schema)
+    read_after_write.clear()
+    async with LifespanManager(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            yield client
+    read_after_write.clear()
+
+
+async def login(client, username="replicauser", password="secret123"):
+    await client.post("/auth/register", json={"username": username, "password": password})
+    r = await client.post(
+        "/auth/login",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_reads_stick_to_primary_after_a_write(replica_client):
+    """Test that a writer reads its own writes, then falls back to the replica."""
+    headers = await login(replica_client)
+    replica_reads = read_sessions.value(target="replica")
+
+    r = await replica_client.post("/notes", json={"title": "Fresh"}, headers=headers)
+    assert r.status_code == 201
+    r = await replica_client.get("/notes", headers=headers)
+    assert [n["title"] for n in r.json()] == ["Fresh"]
+    assert read_sessions.value(target="replica") == replica_reads
+
+    read_after_write.clear()  # the stickiness window has passed
+    r = await replica_client.get("/notes", headers=headers)
+    assert r.status_code == 200
+    assert r.json() == []
+    assert read_sessions.value(target="replica") == replica_reads + 1
+
+
+@pytest.mark.asyncio
+async def test_reads_without_writes_use_replica(replica_client):
+    """Test that a caller who has not written reads from the replica."""
+    writer = await login(replica_client, "replicawriter")
+    reader = await login(replica_client, "replicareader")
+    r = await replica_client.post("/notes", json={"title": "Writer's"}, headers=writer)
+    assert r.status_code == 201
+
+    r = await replica_client.get("/notes/search", params={"q": "writer"}, headers=writer)
+    assert len(r.json()) == 1
+    r = await replica_client.get("/notes", headers=reader)
+    assert r.json() == []
+
+
+def test_read_after_write_window():
+    """Test that stickiness lasts for the configured window only."""
+    sticky = ReadAfterWrite(window_seconds=60)
+    sticky.mark(1)
+    assert sticky.is_sticky(1)
+    assert not sticky.is_sticky(2)
+
+    expired = ReadAfterWrite(window_seconds=0)
+    expired.mark(1)
+    assert not expired.is_sticky(1)
+
+    bounded = ReadAfterWrite(window_seconds=60, max_size=1)
+    bounded.mark(1)
+    bounded.mark(2)
+    assert not bounded.is_sticky(1) and bounded.is_sticky(2)
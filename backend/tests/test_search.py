@@ -0,0 +1,97 @@
+import pytest
+
+from app.db.search import fts5_query
+
+
+# Helper functions for test setup
+async def create_authenticated_user(client, username="searchuser", password="secret123"):
+    """Helper function to register and login a user, returning auth headers."""
+    await client.post(
+        "/auth/register", json={"username": username, "password": password}
+    )
+    r = await client.post(
+        "/auth/login",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def create_note(client, headers, title="Test Note", content="Test Content"):
+    """Helper function to create a note and return the note data."""
+    r = await client.post("/notes", json={"title": title, "content": content}, headers=headers)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def test_fts5_query_quotes_tokens():
+    """Test that FTS5 syntax in user input is neutralised."""
+    assert fts5_query('foo AND "bar" NEAR(baz*') == '"foo" "AND" "bar" "NEAR" "baz"'
+    assert fts5_query("  -*() ") is None
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_and_highlights(async_client):
+    """Test that title matches rank above content matches and terms are marked."""
+    headers = await create_authenticated_user(async_client)
+    in_content = await create_note(async_client, headers, "Groceries", "buy apples and pears")
+    in_title = await create_note(async_client, headers, "Apples", "orchard visit")
+    await create_note(async_client, headers, "Unrelated", "nothing here")
+
+    r = await async_client.get("/notes/search", params={"q": "apples"}, headers=headers)
+    assert r.status_code == 200
+    hits = r.json()
+    assert [h["id"] for h in hits] == [in_title["id"], in_content["id"]]
+    assert hits[0]["rank"] > hits[1]["rank"]
+    assert "<mark>apples</mark>" in hits[1]["snippet"]
+
+
+@pytest.mark.asyncio
+async def test_search_tracks_updates_deletes_and_plans(async_client):
+    """Test that the index follows note edits, deletions and plan titles."""
+    headers = await create_authenticated_user(async_client)
+    note = await create_note(async_client, headers, "Trip", "pack bags")
+    r = await async_client.post(
+        f"/notes/{note['id']}/plans", json={"title": "book ferry"}, headers=headers
+    )
+    assert r.status_code == 201
+
+    async def search(q):
+        r = await async_client.get("/notes/search", params={"q": q}, headers=headers)
+        assert r.status_code == 200
+        return [h["id"] for h in r.json()]
+
+    assert await search("ferry") == [note["id"]]
+    await async_client.put(f"/notes/{note['id']}", json={"content": "pack tent"}, headers=headers)
+    assert await search("bags") == []
+    assert await search("tent") == [note["id"]]
+    await async_client.delete(f"/notes/{note['id']}", headers=headers)
+    assert await search("tent") == []
+
+
+@pytest.mark.asyncio
+async def test_search_is_scoped_and_paginated(async_client):
+    """Test that search only returns the caller's notes, one page at a time."""
+    headers = await create_authenticated_user(async_client)
+    other = await create_authenticated_user(async_client, username="othersearch")
+    await create_note(async_client, other, "Secret recipe", "recipe")
+    ids = [
+        (await create_note(async_client, headers, f"Recipe {i}", "recipe"))["id"]
+        for i in range(3)
+    ]
+
+    r = await async_client.get(
+        "/notes/search", params={"q": "recipe", "limit": 2}, headers=headers
+    )
+    first = [h["id"] for h in r.json()]
+    r = await async_client.get(
+        "/notes/search", params={"q": "recipe", "limit": 2, "offset": 2}, headers=headers
+    )
+    second = [h["id"] for h in r.json()]
+    assert len(first) == 2 and len(second) == 1
+    assert sorted(first + second) == sorted(ids)
+
+    r = await async_client.get("/notes/search", params={"q": "!!"}, headers=headers)
+    assert r.status_code == 200
+    assert r.json() == []
@@ -0,0 +1,61 @@
+import argparse
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+import seed_data
+from app.core.config import settings
+
+
+def seed_args(**overrides):
+    args = dict(
+        database_url=None, users=30, notes_per_user=4, plans_per_note=2, seed=7,
+        batch_size=25, username_prefix="seed", password="password123", quiet=True,
+        as_of=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+@pytest.fixture(autouse=True)
+def restore_slow_query_setting(monkeypatch):
+    # seed() turns the slow-query log off for its own engine
+    monkeypatch.setattr(settings, "SLOW_QUERY_SECONDS", settings.SLOW_QUERY_SECONDS)
+
+
+@pytest.mark.asyncio
+async def test_seed_is_deterministic_and_searchable(tmp_path):
+    """Test that seeding loads every row, rebuilds search and restores triggers."""
+    paths = [tmp_path / "a.db", tmp_path / "b.db"]
+    for path in paths:
+        progress = await seed_data.seed(seed_args(database_url=f"sqlite+aiosqlite:///{path}"))
+        assert progress.counts["users"] == 30
+
+    a, b = (sqlite3.connect(path) for path in paths)
+    for table in ("users", "notes", "plans"):
+        assert a.execute(f"SELECT count(*) FROM {table}").fetchone()[0] == progress.counts[table]
+    notes = "SELECT id, title, content, owner_id, created_at, updated_at FROM notes ORDER BY id"
+    assert a.execute(notes).fetchall() == b.execute(notes).fetchall()
+
+    assert a.execute("SELECT count(*) FROM notes_fts").fetchone()[0] == progress.counts["notes"]
+    triggers = {name for (name,) in a.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    assert set(seed_data.SQLITE_SEARCH_TRIGGERS) <= triggers
+    # Plans are created after their note
+    assert a.execute(
+        "SELECT count(*) FROM plans p JOIN notes n ON n.id = p.note_id WHERE p.created_at < n.created_at"
+    ).fetchone()[0] == 0
+
+
+@pytest.mark.asyncio
+async def test_seed_appends_after_existing_rows(tmp_path):
+    """Test that a second run continues ids instead of colliding."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'seed.db'}"
+    first = await seed_data.seed(seed_args(database_url=url, users=5))
+    await seed_data.seed(seed_args(database_url=url, users=5, username_prefix="more"))
+
+    db = sqlite3.connect(tmp_path / "seed.db")
+    assert db.execute("SELECT count(*), max(id) FROM users").fetchone() == (10, 10)
+    assert db.execute("SELECT min(id) FROM notes WHERE owner_id > 5").fetchone()[0] in (
+        None, first.counts["notes"] + 1
+    )
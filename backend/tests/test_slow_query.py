@@ -0,0 +1,109 @@
+import json
+import logging
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.timing import RequestStats, current_request_stats
+from app.db.base import EngineRegistry
+from app.db.instrumentation import instrument_engine
+from app.db.slow_query import SlowQueryLog, redact_parameters, slow_queries
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+
+class Capture(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.entries = []
+
+    def emit(self, record):
+        self.entries.append(json.loads(record.getMessage()))
+
+
+@pytest.fixture
+def slow_log():
+    capture = Capture()
+    logger = logging.getLogger("notehub.slow_query")
+    logger.addHandler(capture)
+    try:
+        yield capture.entries
+    finally:
+        logger.removeHandler(capture)
+
+
+def request_stats(route, method="GET"):
+    return RequestStats(scope={"method": method, "route": SimpleNamespace(path=route)})
+
+
+async def run_query(engine, sql, **params):
+    async with engine.connect() as conn:
+        await conn.execute(text("CREATE TABLE IF NOT EXISTS t (id INTEGER PRIMARY KEY, secret TEXT)"))
+        return (await conn.execute(text(sql), params)).all()
+
+
+@pytest.mark.asyncio
+async def test_slow_query_logged_as_json_with_plan(slow_log):
+    """Test that slow statements are logged with route, redacted params and plan."""
+    engine = create_async_engine(TEST_DATABASE_URL)
+    instrument_engine(engine.sync_engine, SlowQueryLog(1e-9, explain=True))
+    token = current_request_stats.set(request_stats("/notes/{note_id}"))
+    before = slow_queries.value(route="/notes/{note_id}")
+    try:
+        await run_query(engine, "SELECT id FROM t WHERE secret = :secret", secret="hunter2")
+    finally:
+        current_request_stats.reset(token)
+        await engine.dispose()
+
+    [entry] = [e for e in slow_log if e["statement"].startswith("SELECT id")]
+    assert entry["event"] == "slow_query"
+    assert entry["route"] == "/notes/{note_id}" and entry["method"] == "GET"
+    assert entry["database"] == "sqlite"
+    assert entry["parameters"] == ["str"]
+    assert "hunter2" not in json.dumps(entry)
+    assert entry["duration_ms"] >= 0
+    assert any("SCAN" in line or "SEARCH" in line for line in entry["plan"])
+    assert slow_queries.value(route="/notes/{note_id}") > before
+
+
+@pytest.mark.asyncio
+async def test_fast_queries_and_plans_are_opt_in(slow_log):
+    """Test that statements under the threshold are not logged and plans need explain."""
+    engine = create_async_engine(TEST_DATABASE_URL)
+    instrument_engine(engine.sync_engine, SlowQueryLog(60.0))
+    try:
+        await run_query(engine, "SELECT 1")
+    finally:
+        await engine.dispose()
+    assert slow_log == []
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    instrument_engine(engine.sync_engine, SlowQueryLog(1e-9))
+    try:
+        await run_query(engine, "SELECT 1")
+    finally:
+        await engine.dispose()
+    assert slow_log and all("plan" not in e and e["route"] is None for e in slow_log)
+
+
+@pytest.mark.asyncio
+async def test_registry_engines_use_slow_query_setting(slow_log, monkeypatch):
+    """Test that engines built by the registry honour SLOW_QUERY_SECONDS."""
+    monkeypatch.setattr(settings, "SLOW_QUERY_SECONDS", 1e-9)
+    registry = EngineRegistry()
+    registry.configure(TEST_DATABASE_URL)
+    try:
+        await run_query(registry.engine(), "SELECT 2")
+    finally:
+        await registry.dispose()
+    assert any(e["statement"] == "SELECT 2" for e in slow_log)
+
+
+def test_redact_parameters():
+    """Test that parameter values are replaced by their types."""
+    assert redact_parameters((1, "x", None)) == ["int", "str", "NoneType"]
+    assert redact_parameters({"id": 1}) == {"id": "int"}
+    assert redact_parameters([(1,), (2,)], executemany=True) == {"rows": 2}
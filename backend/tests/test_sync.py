@@ -0,0 +1,95 @@
+import pytest
+
+
+# Helper functions for test setup
+async def create_authenticated_user(client, username="syncuser", password="secret123"):
+    """Helper function to register and login a user, returning auth headers."""
+    await client.post(
+        "/auth/register", json={"username": username, "password": password}
+    )
+    r = await client.post(
+        "/auth/login",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def create_note(client, headers, title="Test Note", content="Test Content"):
+    """Helper function to create a note and return the note data."""
+    r = await client.post("/notes", json={"title": title, "content": content}, headers=headers)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+async def create_plan(client, headers, note_id, title="Plan"):
+    """Helper function to create a plan and return the plan data."""
+    r = await client.post(f"/notes/{note_id}/plans", json={"title": title}, headers=headers)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+@pytest.mark.asyncio
+async def test_initial_sync_returns_everything(async_client):
+    """Test that a sync without a cursor returns all notes and plans."""
+    headers = await create_authenticated_user(async_client)
+    note = await create_note(async_client, headers, "First")
+    plan = await create_plan(async_client, headers, note["id"])
+
+    r = await async_client.get("/sync", headers=headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["cursor"]
+    assert [n["id"] for n in body["notes"]] == [note["id"]]
+    assert "plans" not in body["notes"][0]
+    assert [p["id"] for p in body["plans"]] == [plan["id"]]
+    assert body["deleted"] == []
+
+
+@pytest.mark.asyncio
+async def test_sync_since_cursor_returns_changes_and_tombstones(async_client):
+    """Test that changes and deletions after the cursor are reported."""
+    headers = await create_authenticated_user(async_client)
+    kept = await create_note(async_client, headers, "Kept")
+    doomed = await create_note(async_client, headers, "Doomed")
+    plan = await create_plan(async_client, headers, kept["id"])
+
+    cursor = (await async_client.get("/sync", headers=headers)).json()["cursor"]
+
+    await async_client.put(f"/notes/{kept['id']}", json={"title": "Renamed"}, headers=headers)
+    await async_client.delete(f"/notes/{kept['id']}/plans/{plan['id']}", headers=headers)
+    await async_client.delete(f"/notes/{doomed['id']}", headers=headers)
+
+    r = await async_client.get("/sync", params={"since": cursor}, headers=headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert "Renamed" in [n["title"] for n in body["notes"]]
+    assert doomed["id"] not in [n["id"] for n in body["notes"]]
+    deleted = {(d["entity"], d["id"]) for d in body["deleted"]}
+    assert deleted == {("plan", plan["id"]), ("note", doomed["id"])}
+
+
+@pytest.mark.asyncio
+async def test_sync_is_isolated_between_users(async_client):
+    """Test that sync never returns another user's changes."""
+    headers1 = await create_authenticated_user(async_client, "syncone")
+    headers2 = await create_authenticated_user(async_client, "synctwo")
+    note = await create_note(async_client, headers1, "Private")
+    await create_plan(async_client, headers1, note["id"])
+    await async_client.delete(f"/notes/{note['id']}", headers=headers1)
+
+    r = await async_client.get("/sync", headers=headers2)
+    body = r.json()
+    assert body["notes"] == [] and body["plans"] == []
+
+    r = await async_client.get("/sync", params={"since": body["cursor"]}, headers=headers2)
+    assert r.json()["deleted"] == []
+
+
+@pytest.mark.asyncio
+async def test_sync_invalid_cursor(async_client):
+    """Test that a malformed cursor is rejected."""
+    headers = await create_authenticated_user(async_client)
+    r = await async_client.get("/sync", params={"since": "%%%"}, headers=headers)
+    assert r.status_code == 400
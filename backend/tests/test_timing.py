@@ -0,0 +1,65 @@
+import re
+
+import pytest
+
+from app.core.timing import request_queries, request_seconds, requests_in_flight
+
+
+# Helper functions for test setup
+async def create_authenticated_user(client, username="timinguser", password="secret123"):
+    """Helper function to register and login a user, returning auth headers."""
+    await client.post(
+        "/auth/register", json={"username": username, "password": password}
+    )
+    r = await client.post(
+        "/auth/login",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+SERVER_TIMING = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries", app;dur=([\d.]+)')
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(async_client):
+    """Test that responses summarize DB and total time in Server-Timing."""
+    headers = await create_authenticated_user(async_client)
+    r = await async_client.post("/notes", json={"title": "Timed"}, headers=headers)
+
+    r = await async_client.get(f"/notes/{r.json()['id']}", headers=headers)
+    match = SERVER_TIMING.fullmatch(r.headers["Server-Timing"])
+    assert match, r.headers["Server-Timing"]
+    db_ms, queries, app_ms = float(match[1]), int(match[2]), float(match[3])
+    assert queries >= 2  # version check, then the note with its plans
+    assert 0 < db_ms <= app_ms
+
+    r = await async_client.get("/health")
+    assert SERVER_TIMING.fullmatch(r.headers["Server-Timing"])[2] == "0"
+
+
+@pytest.mark.asyncio
+async def test_request_metrics_use_route_templates(async_client):
+    """Test that latency and query metrics are labelled by route template."""
+    headers = await create_authenticated_user(async_client)
+    r = await async_client.post("/notes", json={"title": "Timed"}, headers=headers)
+    note_url = f"/notes/{r.json()['id']}"
+
+    route = "/notes/{note_id}"
+    before = request_seconds.count(method="GET", route=route, status="200")
+    queries_before = request_queries.count(route=route)
+    await async_client.get(note_url, headers=headers)
+    await async_client.get(note_url, headers=headers)
+    assert request_seconds.count(method="GET", route=route, status="200") == before + 2
+    assert request_queries.count(route=route) == queries_before + 2
+    assert requests_in_flight.value() == 0
+
+    await async_client.get("/no/such/path")
+    assert request_seconds.count(method="GET", route="unmatched", status="404") >= 1
+
+    r = await async_client.get("/metrics")
+    assert 'notehub_http_request_duration_seconds_count{method="GET",route="/notes/{note_id}",status="200"}' in r.text
+    assert "notehub_http_requests_in_flight" in r.text
+    assert "notehub_http_request_db_seconds_bucket" in r.text
@@ -0,0 +1,66 @@
+import time
+
+from app.core.security import create_access_token
+from app.core.token_cache import TokenCache, cache_hits, cache_misses
+
+
+def test_token_cache_hit_and_miss():
+    """Test that a repeated token is served from the cache."""
+    cache = TokenCache(max_size=8, ttl_seconds=60)
+    token = create_access_token(subject="alice", secret_key="secret", user_id=1)
+    hits, misses = cache_hits.value(), cache_misses.value()
+
+    first = cache.get(token, secret_key="secret")
+    second = cache.get(token, secret_key="secret")
+
+    assert first == second
+    assert first["uid"] == 1
+    assert cache_misses.value() == misses + 1
+    assert cache_hits.value() == hits + 1
+
+
+def test_token_cache_rejects_invalid_tokens():
+    """Test that invalid tokens are not cached."""
+    cache = TokenCache(max_size=8, ttl_seconds=60)
+    token = create_access_token(subject="alice", secret_key="secret")
+
+    assert cache.get(token, secret_key="other") is None
+    assert cache.get("not-a-token", secret_key="secret") is None
+    assert len(cache) == 0
+
+
+def test_token_cache_respects_exp(monkeypatch):
+    """Test that cached entries expire together with the token."""
+    from app.core import token_cache as token_cache_module
+
+    cache = TokenCache(max_size=8, ttl_seconds=3600)
+    token = create_access_token(subject="alice", secret_key="secret", expires_minutes=1)
+    payload = cache.get(token, secret_key="secret")
+    assert payload is not None
+
+    # The entry expires at the token's exp, not after the longer cache TTL
+    (expires_at, _), = cache._entries.values()
+    assert expires_at == payload["exp"]
+
+    # Past exp the entry is dropped and the token goes back through decoding,
+    # which rejects it, so nothing is served or re-cached
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 120)
+    monkeypatch.setattr(token_cache_module, "decode_token", lambda *a, **kw: None)
+    assert cache.get(token, secret_key="secret") is None
+    assert len(cache) == 0
+
+
+def test_token_cache_evicts_least_recently_used():
+    """Test that the cache stays within its size bound."""
+    cache = TokenCache(max_size=2, ttl_seconds=60)
+    tokens = [
+        create_access_token(subject=f"user{i}", secret_key="secret") for i in range(3)
+    ]
+    for token in tokens:
+        cache.get(token, secret_key="secret")
+
+    assert len(cache) == 2
+    misses = cache_misses.value()
+    cache.get(tokens[0], secret_key="secret")
+    assert cache_misses.value() == misses + 1
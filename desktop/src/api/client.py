@@ -1,8 +1,9 @@
 """API Client for NoteHub Backend."""
 
 import requests
-from typing import Optional
+from typing import Any, Optional
 from urllib.parse import urljoin
+from urllib3.util.request import ACCEPT_ENCODING
 
 from logger import get_logger
 from models import (
@@ -10,6 +11,7 @@ from models import (
     Note,
     NoteWithPlans,
     Plan,
+    SyncResult,
     LoginRequest,
     RegisterRequest,
     TokenResponse,
@@ -43,10 +45,15 @@ class NoteHubClient:
         """
         self.base_url = base_url.rstrip("/")
         self.token: Optional[str] = None
+        # (url, params) -> (etag, body, X-Next-Cursor) for conditional GETs
+        self._etag_cache: dict[tuple, tuple[str, Any, Optional[str]]] = {}
         self.session = requests.Session()
         self.session.headers.update({
             "Content-Type": "application/json",
             "Accept": "application/json",
+            # Every coding urllib3 can decode here: gzip/deflate, plus br and
+            # zstd when brotli/zstandard are installed
+            "Accept-Encoding": ACCEPT_ENCODING,
         })
         logger.info(f"API Client initialized with base URL: {base_url}")
     
@@ -75,6 +82,39 @@ class NoteHubClient:
             logger.error(f"API Error: {response.status_code} {message}")
             raise APIError(message, response.status_code)
 
+    def _get_cached(self, url: str, params: Optional[dict] = None) -> tuple[Any, Optional[str]]:
+        """
+        GET a JSON resource, revalidating a cached copy with If-None-Match.
+        
+        Args:
+            url: Full URL
+            params: Query parameters
+            
+        Returns:
+            Decoded body and the X-Next-Cursor header, from the cache on 304
+            
+        Raises:
+            APIError: If request fails
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        headers = self._get_headers()
+        cached = self._etag_cache.get(key)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        response = self.session.get(url, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            logger.debug(f"Not modified, using cached copy: {url}")
+            return cached[1], cached[2]
+        self._handle_response(response)
+
+        body = response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag_cache[key] = (etag, body, cursor)
+        return body, cursor
+
     # Auth Methods
 
     def register(self, username: str, password: str) -> User:
@@ -132,6 +172,7 @@ class NoteHubClient:
         
         token_data = TokenResponse(**response.json())
         self.token = token_data.access_token
+        self._etag_cache.clear()  # cached copies belong to the previous user
         return self.token
     
     def get_current_user(self) -> User:
@@ -150,12 +191,40 @@ class NoteHubClient:
         
         return User(**response.json())
     
+    # Sync Methods
+    
+    def sync(self, since: Optional[str] = None) -> SyncResult:
+        """
+        Get notes, plans and deletions changed since a cursor.
+        
+        Args:
+            since: Cursor from a previous sync (None for everything)
+            
+        Returns:
+            Changes and the cursor to pass to the next sync
+            
+        Raises:
+            APIError: If request fails
+        """
+        url = self._get_url("/sync")
+        params = {"since": since} if since else None
+        response = self.session.get(url, params=params, headers=self._get_headers())
+        self._handle_response(response)
+        
+        return SyncResult(**response.json())
+    
     # Notes Methods
     
-    def get_notes(self) -> list[Note]:
+    def get_notes(self, page_size: int = 200) -> list[Note]:
         """
-        Get all notes for current user.
+        Get all notes for current user, most recently updated first.
+        
+        Uses the summary view: notes carry no content or plans, load them
+        with get_note() when a note is opened.
         
+        Args:
+            page_size: Number of notes fetched per request
+            
         Returns:
             List of notes
             
@@ -163,10 +232,14 @@ class NoteHubClient:
             APIError: If request fails
         """
         url = self._get_url("/notes")
-        response = self.session.get(url, headers=self._get_headers())
-        self._handle_response(response)
-        
-        return [Note(**note) for note in response.json()]
+        params = {"limit": page_size, "view": "summary"}
+        notes: list[Note] = []
+        while True:
+            body, cursor = self._get_cached(url, params)
+            notes.extend(Note(**note) for note in body)
+            if not cursor:
+                return notes
+            params = {"limit": page_size, "view": "summary", "cursor": cursor}
     
     def get_note(self, note_id: int) -> NoteWithPlans:
         """
@@ -182,10 +255,9 @@ class NoteHubClient:
             APIError: If note not found or request fails
         """
         url = self._get_url(f"/notes/{note_id}")
-        response = self.session.get(url, headers=self._get_headers())
-        self._handle_response(response)
+        body, _ = self._get_cached(url)
         
-        return NoteWithPlans(**response.json())
+        return NoteWithPlans(**body)
     
     def create_note(self, title: str, content: str = "") -> Note:
         """
@@ -267,10 +339,9 @@ class NoteHubClient:
             APIError: If request fails
         """
         url = self._get_url(f"/notes/{note_id}/plans")
-        response = self.session.get(url, headers=self._get_headers())
-        self._handle_response(response)
+        body, _ = self._get_cached(url)
         
-        return [Plan(**plan) for plan in response.json()]
+        return [Plan(**plan) for plan in body]
     
     def create_plan(
         self,
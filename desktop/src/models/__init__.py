@@ -50,6 +50,24 @@ class NoteWithPlans(Note):
     plans: list[Plan] = []
 
 
+class Tombstone(BaseModel):
+    """Deleted note or plan reported by sync."""
+    
+    entity: str  # "note" or "plan"
+    id: int
+    note_id: Optional[int] = None
+    deleted_at: datetime
+
+
+class SyncResult(BaseModel):
+    """Changes since a sync cursor."""
+    
+    cursor: str
+    notes: list[Note] = []
+    plans: list[Plan] = []
+    deleted: list[Tombstone] = []
+
+
 class LoginRequest(BaseModel):
     """Login request."""
     
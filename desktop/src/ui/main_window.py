@@ -22,7 +22,7 @@ from PySide6.QtCore import Qt, QDate
 from PySide6.QtGui import QFont
 
 from api.client import NoteHubClient, APIError
-from models import Note, NoteWithPlans, Plan
+from models import Note, NoteWithPlans, Plan, SyncResult
 
 
 class MainWindow(QMainWindow):
@@ -41,6 +41,7 @@ class MainWindow(QMainWindow):
         self.username = username
         self.current_note: NoteWithPlans | None = None
         self.notes: list[Note] = []
+        self.sync_cursor: str | None = None
         
         self.setup_ui()
         self.load_notes()
@@ -195,19 +196,54 @@ class MainWindow(QMainWindow):
         return panel
     
     def load_notes(self):
-        """Load all notes from backend."""
+        """Load notes from backend; after the first load only changes are fetched."""
         try:
-            self.notes = self.client.get_notes()
+            result = self.client.sync(self.sync_cursor)
+            if self.sync_cursor is None:
+                self.notes = result.notes
+                self.sort_notes()
+                message = f"Loaded {len(self.notes)} notes"
+            else:
+                self.apply_changes(result)
+                changed = len(result.notes) + len(result.plans) + len(result.deleted)
+                message = f"Synced {changed} changes"
+            self.sync_cursor = result.cursor
             self.update_notes_list()
-            self.statusBar().showMessage(f"Loaded {len(self.notes)} notes", 3000)
+            self.statusBar().showMessage(message, 3000)
         except APIError as e:
             QMessageBox.critical(self, "Error", f"Failed to load notes: {e.message}")
     
+    def sort_notes(self):
+        """Keep notes most recently updated first, matching server ordering."""
+        self.notes.sort(key=lambda n: (n.updated_at, n.id), reverse=True)
+    
+    def apply_changes(self, result: SyncResult):
+        """Merge sync changes into the local notes list and open note."""
+        deleted_notes = {d.id for d in result.deleted if d.entity == "note"}
+        changed = {note.id: note for note in result.notes}
+        self.notes = [
+            changed.pop(n.id, n) for n in self.notes if n.id not in deleted_notes
+        ] + list(changed.values())
+        self.sort_notes()
+        
+        if not self.current_note:
+            return
+        current_id = self.current_note.id
+        if current_id in deleted_notes:
+            self.clear_editor()
+        elif (
+            any(n.id == current_id for n in result.notes)
+            or any(p.note_id == current_id for p in result.plans)
+            or any(d.note_id == current_id for d in result.deleted)
+        ):
+            self.load_note(current_id)
+    
     def update_notes_list(self):
         """Update the notes list widget."""
         self.notes_list.clear()
         
-        for note in sorted(self.notes, key=lambda n: n.updated_at, reverse=True):
+        # Notes are kept in server order (most recently updated first)
+        for note in self.notes:
             item = QListWidgetItem(note.title)
             item.setData(Qt.UserRole, note.id)
             self.notes_list.addItem(item)
@@ -303,7 +339,7 @@ class MainWindow(QMainWindow):
         """Create a new note."""
         try:
             note = self.client.create_note("Untitled Note", "")
-            self.notes.append(note)
+            self.notes.insert(0, note)
             self.update_notes_list()
             self.load_note(note.id)
             self.statusBar().showMessage("New note created", 3000)
@@ -330,11 +366,8 @@ class MainWindow(QMainWindow):
         try:
             updated = self.client.update_note(self.current_note.id, title, content)
             
-            # Update in list
-            for i, note in enumerate(self.notes):
-                if note.id == updated.id:
-                    self.notes[i] = updated
-                    break
+            # Move to the top of the list, matching server ordering
+            self.notes = [updated] + [n for n in self.notes if n.id != updated.id]
             
             self.update_notes_list()
             self.statusBar().showMessage("Note saved", 3000)
@@ -365,27 +398,29 @@ class MainWindow(QMainWindow):
             self.notes = [n for n in self.notes if n.id != self.current_note.id]
             self.update_notes_list()
             
-            # Clear editor
-            self.current_note = None
-            self.note_title.clear()
-            self.note_content.clear()
-            self.note_title.setEnabled(False)
-            self.note_content.setEnabled(False)
-            self.save_btn.setEnabled(False)
-            self.delete_btn.setEnabled(False)
-            self.add_plan_btn.setEnabled(False)
-            self.placeholder.show()
-            
-            while self.plans_layout.count():
-                item = self.plans_layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
-            
+            self.clear_editor()
             self.statusBar().showMessage("Note deleted", 3000)
             
         except APIError as e:
             QMessageBox.critical(self, "Error", f"Failed to delete note: {e.message}")
     
+    def clear_editor(self):
+        """Close the current note and reset the editor panel."""
+        self.current_note = None
+        self.note_title.clear()
+        self.note_content.clear()
+        self.note_title.setEnabled(False)
+        self.note_content.setEnabled(False)
+        self.save_btn.setEnabled(False)
+        self.delete_btn.setEnabled(False)
+        self.add_plan_btn.setEnabled(False)
+        self.placeholder.show()
+        
+        while self.plans_layout.count():
+            item = self.plans_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+    
     def add_plan(self):
         """Add a new plan to current note."""
         if not self.current_note:
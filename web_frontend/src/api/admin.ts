@@ -1,10 +1,21 @@
 import { api } from './client'
-import type { User, Note } from '../types'
+import type { AdminUser, Note, Page } from '../types'
+
+export const ADMIN_USERS_PAGE_SIZE = 50
 
 export const adminApi = {
-  async getAllUsers(): Promise<User[]> {
-    const response = await api.get<User[]>('/admin/users')
-    return response.data
+  async getUsers(params: { cursor?: string | null; q?: string } = {}): Promise<Page<AdminUser>> {
+    const response = await api.get<AdminUser[]>('/admin/users', {
+      params: {
+        limit: ADMIN_USERS_PAGE_SIZE,
+        cursor: params.cursor || undefined,
+        q: params.q || undefined,
+      },
+    })
+    return {
+      items: response.data,
+      nextCursor: response.headers['x-next-cursor'] ?? null,
+    }
   },
 
   async getAllNotes(): Promise<Note[]> {
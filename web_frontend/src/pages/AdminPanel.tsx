@@ -1,16 +1,34 @@
-import { useState } from 'react'
-import { useQuery } from '@tanstack/react-query'
+import { useEffect, useState } from 'react'
+import { useInfiniteQuery, useQuery } from '@tanstack/react-query'
 import { adminApi } from '../api/admin'
 import { useNavigate } from 'react-router-dom'
 
 export default function AdminPanel() {
   const navigate = useNavigate()
   const [expandedNoteId, setExpandedNoteId] = useState<number | null>(null)
+  const [searchInput, setSearchInput] = useState('')
+  const [search, setSearch] = useState('')
 
-  const { data: users, isLoading: usersLoading, error: usersError } = useQuery({
-    queryKey: ['admin', 'users'],
-    queryFn: adminApi.getAllUsers,
+  // Debounce the username prefix search
+  useEffect(() => {
+    const timer = setTimeout(() => setSearch(searchInput.trim()), 300)
+    return () => clearTimeout(timer)
+  }, [searchInput])
+
+  const {
+    data: usersData,
+    isLoading: usersLoading,
+    error: usersError,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
+    queryKey: ['admin', 'users', search],
+    queryFn: ({ pageParam }) => adminApi.getUsers({ cursor: pageParam, q: search }),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
   })
+  const users = usersData?.pages.flatMap((page) => page.items)
 
   const { data: notes, isLoading: notesLoading } = useQuery({
     queryKey: ['admin', 'notes'],
@@ -35,7 +53,7 @@ export default function AdminPanel() {
     )
   }
 
-  if (usersLoading || notesLoading) {
+  if ((usersLoading && !search) || notesLoading) {
     return (
       <div className="min-h-screen bg-gray-50 flex items-center justify-center">
         <div className="text-gray-600">Loading admin data...</div>
@@ -53,10 +71,17 @@ export default function AdminPanel() {
 
         {/* Users Section */}
         <div className="bg-white rounded-lg shadow-md mb-8">
-          <div className="px-6 py-4 border-b border-gray-200">
+          <div className="px-6 py-4 border-b border-gray-200 flex items-center justify-between">
             <h2 className="text-xl font-semibold text-gray-900">
-              All Users ({users?.length || 0})
+              Users ({users?.length || 0}{hasNextPage ? '+' : ''})
             </h2>
+            <input
+              type="search"
+              value={searchInput}
+              onChange={(e) => setSearchInput(e.target.value)}
+              placeholder="Search by username prefix"
+              className="px-3 py-1.5 border border-gray-300 rounded-md text-sm focus:outline-none focus:ring-2 focus:ring-indigo-500"
+            />
           </div>
           <div className="overflow-x-auto">
             <table className="min-w-full divide-y divide-gray-200">
@@ -71,6 +96,12 @@ export default function AdminPanel() {
                   <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">
                     Role
                   </th>
+                  <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">
+                    Notes
+                  </th>
+                  <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">
+                    Plans
+                  </th>
                 </tr>
               </thead>
               <tbody className="bg-white divide-y divide-gray-200">
@@ -98,11 +129,28 @@ export default function AdminPanel() {
                         </span>
                       )}
                     </td>
+                    <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
+                      {user.note_count}
+                    </td>
+                    <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
+                      {user.plan_count}
+                    </td>
                   </tr>
                 ))}
               </tbody>
             </table>
           </div>
+          {hasNextPage && (
+            <div className="px-6 py-4 border-t border-gray-200 text-center">
+              <button
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+                className="px-4 py-2 text-sm bg-gray-100 text-gray-700 rounded-md hover:bg-gray-200 disabled:opacity-50"
+              >
+                {isFetchingNextPage ? 'Loading...' : 'Load more users'}
+              </button>
+            </div>
+          )}
         </div>
 
         {/* Notes Section */}
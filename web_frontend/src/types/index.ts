@@ -6,6 +6,16 @@ export interface User {
   is_admin?: boolean;
 }
 
+export interface AdminUser extends User {
+  note_count: number;
+  plan_count: number;
+}
+
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
 export interface Note {
   id: number;
   title: string;